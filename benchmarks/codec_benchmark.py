@@ -0,0 +1,71 @@
+"""
+Compare the wire codecs on StateUpdate messages of growing size.
+Run from the root of the repository: python -m benchmarks.codec_benchmark
+"""
+import random
+import timeit
+
+from infrastructure.message_codec import available_codecs, get_codec
+from infrastructure.messages.stateUpdateMessage import StateUpdateMessage
+from models.clusterView import ClusterView
+from models.serverElement import ServerElement
+from models.serversData import ServersData
+from models.userRequest import UserRequest
+from models.usersRequests import UsersRequests
+
+SIZES = (10, 1_000, 10_000)
+APPS = ("MC", "GW", "Mid", "Heart", "Emda")
+STATUSES = ("Active", "Down", "Backup")
+ENVS = ("preprod", "prod")
+
+
+def build_message(servers_count: int) -> StateUpdateMessage:
+    rng = random.Random(servers_count)
+    servers = []
+    for index in range(servers_count):
+        element = ServerElement()
+        element.host = f"server-{index:05d}"
+        element.app = rng.choice(APPS)
+        element.status = rng.choice(STATUSES)
+        element.env = rng.choice(ENVS)
+        element.available = rng.random() < 0.5
+        element.reservation = "" if element.available else rng.choice(("Raphael", "Odelia", "Operational"))
+        element.since = -1 if element.available else 1747941424 + index
+        element.comment = ""
+        servers.append(element)
+
+    cluster_view = ClusterView()
+    for index in range(20):
+        cluster_view.add_or_update(f"10.0.0.{index}", "slave")
+
+    user_requests = UsersRequests()
+    for index in range(10):
+        user_requests.add(UserRequest(f"10.0.0.{index}", 1747941424, False, f"server-{index:05d}", "Raphael", ""))
+
+    return StateUpdateMessage(ServersData(1747941424, servers), cluster_view, user_requests, 1)
+
+
+def measure(function, repeat: int = 5) -> float:
+    number = 1
+    while timeit.timeit(function, number=number) < 0.05:
+        number *= 2
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main():
+    print(f"{'servers':>8} {'codec':>8} {'size (B)':>10} {'encode (ms)':>12} {'decode (ms)':>12}")
+    for servers_count in SIZES:
+        msg = build_message(servers_count).to_dict()
+
+        for name in available_codecs():
+            codec = get_codec(name)
+            data = codec.encode(msg)
+            assert codec.decode(data) == msg, f"{name} codec does not round-trip"
+
+            encode_time = measure(lambda: codec.encode(msg))
+            decode_time = measure(lambda: codec.decode(data))
+            print(f"{servers_count:>8} {name:>8} {len(data):>10} {encode_time * 1000:>12.3f} {decode_time * 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
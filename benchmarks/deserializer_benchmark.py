@@ -0,0 +1,62 @@
+"""
+Measure the decoding of every message type by the registry-based deserializer, with a deserializer kept for the
+connection and with a new deserializer per message as it used to be done.
+Run from the root of the repository: python -m benchmarks.deserializer_benchmark
+"""
+import json
+
+from benchmarks.codec_benchmark import build_message, measure
+from infrastructure.message_deserializer import MessageDeserializer
+from infrastructure.messages.actionRequestMessage import ActionRequestMessage
+from infrastructure.messages.fetchStateMessage import FetchStateMessage
+from infrastructure.messages.forceMasterMessage import ForceMasterMessage
+from infrastructure.messages.generalMessage import GeneralMessage
+from infrastructure.messages.heartbeatMessage import HeartBeatMessage
+from infrastructure.messages.joinRequestMessage import JoinRequestMessage
+from infrastructure.messages.joinResponseMessage import JoinResponseMessage
+from infrastructure.messages.leaveNotificationMessage import LeaveNotificationMessage
+from infrastructure.messages.stateDeltaMessage import StateDeltaMessage
+from infrastructure.messages.stateNotModifiedMessage import StateNotModifiedMessage
+from infrastructure.messages.subscribeStateMessage import SubscribeStateMessage
+from models.stateDelta import StateDelta
+from models.userRequest import UserRequest
+
+STATE_SERVERS = 1_000
+
+
+def build_messages() -> list[GeneralMessage]:
+    state = build_message(STATE_SERVERS)
+    rows = [element.to_dict() for element in state.servers_data.servers_list[:10]]
+    return [ActionRequestMessage(UserRequest("10.0.0.1", 1747941424, False, "server-00001", "Raphael", "")),
+            FetchStateMessage(12),
+            ForceMasterMessage("10.0.0.1"),
+            HeartBeatMessage(),
+            JoinRequestMessage("10.0.0.1", ["msgpack", "struct", "json"]),
+            JoinResponseMessage("10.0.0.2", 12, "struct"),
+            LeaveNotificationMessage("10.0.0.1"),
+            StateDeltaMessage(StateDelta(12, 13, 1747941424, STATE_SERVERS, list(enumerate(rows)))),
+            StateNotModifiedMessage(12),
+            state,
+            SubscribeStateMessage(12)]
+
+
+def main():
+    messages = build_messages()
+    missing = set(GeneralMessage.registered_types()) - {message.MESSAGE_TYPE for message in messages}
+    assert not missing, f"No sample message for {missing}"
+
+    deserializer = MessageDeserializer()
+    print(f"{'type':>18} {'shared (us)':>12} {'per message (us)':>17}")
+    for message in messages:
+        # Decoded like they arrive from the network
+        msg = json.loads(json.dumps(message.to_dict()))
+        decoded = deserializer.deserialize(msg)
+        assert decoded.to_dict() == msg, f"{message.MESSAGE_TYPE} does not round-trip"
+
+        shared_time = measure(lambda: deserializer.deserialize(msg))
+        per_message_time = measure(lambda: MessageDeserializer().deserialize(msg))
+        print(f"{message.MESSAGE_TYPE:>18} {shared_time * 1e6:>12.2f} {per_message_time * 1e6:>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare the memory held by a fleet of servers, and the time to snapshot it, before and after the compact elements.
+Run from the root of the repository: python -m benchmarks.memory_benchmark
+"""
+import json
+import random
+import timeit
+import tracemalloc
+
+from models.serverElement import ServerElement
+from models.serversData import ServersData
+
+SIZES = (5_000, 50_000)
+APPS = ("MC", "GW", "Mid", "Heart", "Emda")
+STATUSES = ("Active", "Down", "Backup")
+ENVS = ("preprod", "prod")
+
+
+class DictServerElement:
+    """The former ServerElement: a __dict__ per element, no shared strings."""
+
+    def __init__(self):
+        self.host: str = ""
+        self.app: str = ""
+        self.status: str = ""
+        self.env: str = ""
+        self.available: bool | None = None
+        self.reservation: str = ""
+        self.since: int = 0
+        self.comment: str = ""
+        self.last_update: int = 0
+
+    def from_json(self, data_element: dict):
+        for name in ("host", "app", "status", "env", "available", "reservation", "since", "comment"):
+            setattr(self, name, data_element.get(name))
+        self.last_update = data_element.get("lastUpdate", 0)
+        return self
+
+    def clone(self):
+        new = DictServerElement()
+        new.__dict__.update(self.__dict__)
+        return new
+
+
+def build_payload(servers_count: int) -> str:
+    rng = random.Random(servers_count)
+    rows = []
+    for index in range(servers_count):
+        available = rng.random() < 0.5
+        rows.append({"host": f"server-{index:05d}", "app": rng.choice(APPS), "status": rng.choice(STATUSES),
+                     "env": rng.choice(ENVS), "available": available,
+                     "reservation": "" if available else rng.choice(("Raphael", "Odelia", "Operational")),
+                     "since": -1 if available else 1747941424 + index, "comment": ""})
+
+    return json.dumps(rows)
+
+
+def measure_memory(function) -> tuple[object, int]:
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def measure(function, repeat: int = 5) -> float:
+    number = 1
+    while timeit.timeit(function, number=number) < 0.05:
+        number *= 2
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main():
+    print(f"{'servers':>8} {'elements':>9} {'memory (KB)':>12} {'clone (ms)':>11} {'clone memory (KB)':>18}")
+    for servers_count in SIZES:
+        # The rows are decoded like they arrive from the network, with a string object per value. Only what the
+        # elements keep is counted
+        payload = build_payload(servers_count)
+
+        # Former layout: dict-backed elements, deep-copied on every snapshot
+        legacy, legacy_size = measure_memory(
+            lambda: [DictServerElement().from_json(row) for row in json.loads(payload)])
+        _, legacy_clone_size = measure_memory(lambda: [element.clone() for element in legacy])
+        legacy_clone_time = measure(lambda: [element.clone() for element in legacy])
+        print(f"{servers_count:>8} {'dict':>9} {legacy_size / 1024:>12.0f} {legacy_clone_time * 1000:>11.3f} "
+              f"{legacy_clone_size / 1024:>18.0f}")
+
+        # Current layout: slotted elements with interned strings, copy-on-write snapshots
+        compact, compact_size = measure_memory(
+            lambda: ServersData(0, [ServerElement().from_json(row) for row in json.loads(payload)]))
+        _, compact_clone_size = measure_memory(compact.clone)
+        compact_clone_time = measure(compact.clone)
+        print(f"{servers_count:>8} {'slots':>9} {compact_size / 1024:>12.0f} {compact_clone_time * 1000:>11.3f} "
+              f"{compact_clone_size / 1024:>18.0f}")
+
+
+if __name__ == '__main__':
+    main()
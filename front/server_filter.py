@@ -0,0 +1,61 @@
+from typing import Callable, NamedTuple
+
+from models.filterState import FilterState
+from models.serverElement import ServerElement
+
+
+class SearchRow(NamedTuple):
+    """Lowercased fields of a server, computed once per change of the server instead of once per keystroke."""
+    host: str
+    app: str
+    status: str
+    env: str
+    available: str
+    since: str
+    reservation: str
+    # All the fields in a single string, so a query is matched against a row with a single substring search. The
+    # separator never appears in a query typed in the search bar, so a match never spans two fields
+    key: str
+    is_available: object  # Raw availability, True, False or "other"
+
+
+def build_search_row(entry: ServerElement) -> SearchRow:
+    reservation = "Available" if entry.available == True else entry.reservation
+    fields = (entry.host.lower(), entry.app.lower(), entry.status.lower(), entry.env.lower(),
+              str(entry.available).lower(), str(entry.since).lower(), reservation.lower())
+    return SearchRow(*fields, "\n".join(fields), entry.available)
+
+
+def compile_conditions(state: FilterState | None) -> list[Callable[[SearchRow], bool]]:
+    """
+    Turn the state of the filter controls into the list of the predicates a row must pass, so the controls are
+    only read once and the inactive filters cost nothing.
+    """
+    if state is None:
+        return []
+
+    conditions = []
+    # 1) Availability filter
+    # If “Available” is checked, hide any non-available servers
+    if state.available:
+        conditions.append(lambda row: bool(row.is_available))
+    # If “Busy” is checked, hide any available servers
+    if state.busy:
+        conditions.append(lambda row: not row.is_available)
+
+    # 2) Operational filter
+    # If “Operational” is checked, only show items whose reservation is exactly “operational”
+    if state.operational:
+        conditions.append(lambda row: row.reservation == "operational")
+
+    # 3) Type filter
+    # If a specific type (not “All”) is selected, require it to appear in the app name
+    if state.type != "All":
+        server_type = state.type.lower()
+        conditions.append(lambda row: server_type in row.app)
+
+    if state.env != "All":
+        env = state.env.lower()
+        conditions.append(lambda row: row.env == env)
+
+    return conditions
@@ -0,0 +1,35 @@
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class ThrottledCall(QObject):
+    """
+    Call a function at most once per interval.
+    The first trigger calls it right away, the triggers received during the interval are merged into a single call
+    when the interval ends, so the last change is never missed.
+    """
+
+    def __init__(self, function: Callable[[], None], interval_ms: int, parent=None):
+        super().__init__(parent)
+        self._function = function
+        self._pending = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def trigger(self, *_):
+        if self._timer.isActive():
+            self._pending = True
+            return
+
+        self._function()
+        self._timer.start()
+
+    def _on_timeout(self):
+        if self._pending:
+            self._pending = False
+            self._function()
+            self._timer.start()
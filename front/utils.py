@@ -27,15 +27,7 @@ def free_server(data: ServersData, host_name: str, comment: str):
     Updates the 'available' flag to True and sets 'since' to the current timestamp.
     """
     # Update matching entry
-    updated = False
-    for entry in data.servers_list:
-        if entry.host == host_name:
-            entry.available = True
-            entry.since = -1
-            entry.reservation = ""
-            entry.comment = comment
-            updated = True
-            break
+    updated = data.update_server(host_name, available=True, since=-1, reservation="", comment=comment)
 
     if not updated:
         raise RuntimeError(f"Host '{host_name}' not found in data file.")
@@ -44,20 +36,11 @@ def free_server(data: ServersData, host_name: str, comment: str):
 
 def book_server(data: ServersData, host_name, user_name, comment):
     # Update matching entry
-    updated = False
-    for entry in data.servers_list:
-        if entry.host == host_name:
-            if user_name == "Operational":
-                entry.available = "other"
-            else:
-                entry.available = False
-            entry.since = int(time.time())
-            entry.reservation = user_name
-            entry.comment = comment
-            updated = True
-            break
+    available = "other" if user_name == "Operational" else False
+    updated = data.update_server(host_name, available=available, since=int(time.time()), reservation=user_name,
+                                 comment=comment)
 
     if not updated:
         raise RuntimeError(f"Host '{host_name}' not found in data file.")
 
-    return True
\ No newline at end of file
+    return True
@@ -1,17 +1,21 @@
-from datetime import datetime
-from functools import partial
-
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QTableWidgetItem, QTableWidget, QVBoxLayout, QDialog, QPushButton, QWidget, QHBoxLayout
+from PySide6.QtCore import Qt, QModelIndex
+from PySide6.QtWidgets import QTableView, QVBoxLayout, QDialog, QHeaderView
 
+from front.column_width import ColumnWidth
 from front.utils import book_server, free_server
+from front.widgets.acceptButtonDelegate import AcceptButtonDelegate
+from front.widgets.requestsTableModel import REQUEST_ROLE, RequestsTableModel
+from infrastructure.shared_models.shared_model import batch
 from infrastructure.shared_models.shared_serversData import SharedServersData
 from infrastructure.shared_models.shared_userRequests import SharedUserRequests
 from infrastructure.validator import validate_user_request
+from models.changeSet import ChangeSet
 from models.userRequest import UserRequest
 
 
 class RequestsDialog(QDialog):
+    ROW_HEIGHT = 40
+
     def __init__(self, shared_servers: SharedServersData, shared_requests: SharedUserRequests, is_admin: bool, is_master: bool, parent=None):
         super().__init__(parent)
         self.setWindowTitle("User Requests")
@@ -24,63 +28,64 @@ class RequestsDialog(QDialog):
 
         layout = QVBoxLayout(self)
 
-        self.table = QTableWidget(0, 6, self)
-        self.table.setHorizontalHeaderLabels(["User", "Time", "Available", "Host", "Comment", "Action"])
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.model = RequestsTableModel(self)
+        self.accept_delegate = AcceptButtonDelegate(self.is_admin and self.is_master, self)
+        self.accept_delegate.accepted.connect(self.on_accept_clicked)
+
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(RequestsTableModel.ACTION, self.accept_delegate)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.setSelectionMode(QTableView.NoSelection)
         self.table.setFocusPolicy(Qt.NoFocus)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setMouseTracking(True)
         self.table.setShowGrid(False)
-        self.table.setFrameShape(QTableWidget.NoFrame)
+        self.table.setFrameShape(QTableView.NoFrame)
         self.table.verticalHeader().setVisible(False)
+        # Same height for every row, the view doesn't measure the rows
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+        self.set_column_widths()
         layout.addWidget(self.table)
 
-        self.shared_requests.dataChanged.connect(self.populate_table)
-        self.populate_table()
-
-    def populate_table(self):
-        reqs: list[UserRequest] = self.shared_requests.data.requests or []
-        self.table.setRowCount(len(reqs))
-
-        for row, r in enumerate(reqs):
-            self.table.setItem(row, 0, QTableWidgetItem(r.user))
-            self.table.item(row, 0).setTextAlignment(Qt.AlignCenter)
-            self.table.setRowHeight(row, 40)
-
-            t = datetime.fromtimestamp(r.timestamp)
-            self.table.setItem(row, 1, QTableWidgetItem(t.strftime("%Y-%m-%d %H:%M:%S")))
-            self.table.item(row, 1).setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 2, QTableWidgetItem("Yes" if r.available else "No"))
-            self.table.item(row, 2).setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 3, QTableWidgetItem(r.host))
-            self.table.item(row, 3).setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 4, QTableWidgetItem(r.comment))
-            self.table.item(row, 4).setTextAlignment(Qt.AlignCenter)
-
-            # Add Accept button
-            button = QPushButton("Accept")
-            button.setEnabled(self.is_admin and self.is_master)
-            button.clicked.connect(partial(self.accept_request, r))
-
-            container = QWidget()
-            layout = QHBoxLayout(container)
-            layout.setContentsMargins(0, 0, 0, 0)
-            layout.addWidget(button)
-            layout.setAlignment(Qt.AlignCenter)
-            self.table.setCellWidget(row, 5, container)
-        self.table.resizeColumnsToContents()
+        self.model.set_requests(self.shared_requests.data.requests or [])
+        self.shared_requests.changed.connect(self.on_requests_changed)
+
+    def set_column_widths(self):
+        """The widths are computed once from the font, they don't follow the content of the rows."""
+        header = self.table.horizontalHeader()
+        metrics = self.table.fontMetrics()
+        padding = 2 * metrics.averageCharWidth()
+        widths = {RequestsTableModel.USER: ColumnWidth.RESERVATION,
+                  RequestsTableModel.TIME: metrics.horizontalAdvance("0000-00-00 00:00:00") + padding,
+                  RequestsTableModel.AVAILABLE: ColumnWidth.AVAILABLE,
+                  RequestsTableModel.HOST: ColumnWidth.HOST}
+        for column, width in widths.items():
+            header.setSectionResizeMode(column, QHeaderView.Interactive)
+            header.resizeSection(column, width)
+
+        header.setSectionResizeMode(RequestsTableModel.COMMENT, QHeaderView.Stretch)
+        header.setSectionResizeMode(RequestsTableModel.ACTION, QHeaderView.Fixed)
+        header.resizeSection(RequestsTableModel.ACTION, self.accept_delegate.cell_width(metrics))
+
+    def on_requests_changed(self, changes: ChangeSet):
+        self.model.apply_changes(self.shared_requests.data.requests or [], changes)
+
+    def on_accept_clicked(self, index: QModelIndex):
+        self.accept_request(index.data(REQUEST_ROLE))
 
     def accept_request(self, req: UserRequest):
-        if validate_user_request(self.shared_servers.data, req):
-            if not req.available:
-                book_server(self.shared_servers.data, req.host, req.user, req.comment)
+        with batch(self.shared_servers, self.shared_requests):
+            if validate_user_request(self.shared_servers.data, req):
+                with self.shared_servers.mutate() as servers_data:
+                    if not req.available:
+                        book_server(servers_data, req.host, req.user, req.comment)
+                    else:
+                        free_server(servers_data, req.host, req.comment)
+
+                print(f"Request for host {req.host} accepted")
             else:
-                free_server(self.shared_servers.data, req.host, req.comment)
-
-            print(f"Request for host {req.host} accepted")
-        else:
-            print(f"Request for host {req.host} not valid. Deleting.")
+                print(f"Request for host {req.host} not valid. Deleting.")
 
-        self.shared_requests.data.requests.remove(req)
-        self.shared_requests.dataChanged.emit()
-        self.shared_servers.dataChanged.emit()
+            with self.shared_requests.mutate() as users_requests:
+                users_requests.remove(req)
@@ -0,0 +1,63 @@
+from PySide6.QtCore import QEvent, QModelIndex, QPersistentModelIndex, QRect, QSize, Qt, Signal
+from PySide6.QtGui import QFontMetrics
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem
+
+
+class AcceptButtonDelegate(QStyledItemDelegate):
+    """
+    Paint an Accept button in the cells of its column, and emit `accepted` with the index of the clicked cell.
+    Only the visible cells are painted, no button widget is created per row.
+    """
+
+    accepted = Signal(QModelIndex)
+
+    TEXT = "Accept"
+    BUTTON_HEIGHT = 28
+    BUTTON_PADDING = 24
+
+    def __init__(self, enabled: bool, parent=None):
+        super().__init__(parent)
+        self.enabled = enabled
+        self._pressed: QPersistentModelIndex | None = None  # Cell where the button has been pressed
+
+    def _button_rect(self, option: QStyleOptionViewItem) -> QRect:
+        width = min(option.fontMetrics.horizontalAdvance(self.TEXT) + self.BUTTON_PADDING, option.rect.width())
+        rect = QRect(0, 0, width, min(self.BUTTON_HEIGHT, option.rect.height()))
+        rect.moveCenter(option.rect.center())
+        return rect
+
+    def paint(self, painter, option: QStyleOptionViewItem, index):
+        button = QStyleOptionButton()
+        button.rect = self._button_rect(option)
+        button.text = self.TEXT
+        button.state = QStyle.State_Enabled if self.enabled else QStyle.State_None
+        if self.enabled and self._pressed == index:
+            button.state |= QStyle.State_Sunken
+        elif self.enabled and option.state & QStyle.State_MouseOver:
+            button.state |= QStyle.State_MouseOver
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def cell_width(self, metrics: QFontMetrics) -> int:
+        return metrics.horizontalAdvance(self.TEXT) + 2 * self.BUTTON_PADDING
+
+    def sizeHint(self, option: QStyleOptionViewItem, index):
+        return QSize(self.cell_width(option.fontMetrics), self.BUTTON_HEIGHT)
+
+    def editorEvent(self, event, model, option: QStyleOptionViewItem, index):
+        if not self.enabled or event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+
+        on_button = self._button_rect(option).contains(event.position().toPoint())
+        if event.type() == QEvent.MouseButtonPress:
+            self._pressed = QPersistentModelIndex(index) if on_button else None
+            return on_button
+
+        clicked = on_button and self._pressed == index
+        self._pressed = None
+        if clicked:
+            self.accepted.emit(index)
+        return clicked
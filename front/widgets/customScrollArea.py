@@ -1,9 +0,0 @@
-from PySide6.QtGui import QWheelEvent
-from PySide6.QtWidgets import QScrollArea
-
-
-class CustomScrollArea(QScrollArea):
-    def wheelEvent(self, event: QWheelEvent):
-        delta = event.angleDelta().y() // 8
-        self.verticalScrollBar().setValue(
-            self.verticalScrollBar().value() - delta)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import QFrame, QLineEdit, QVBoxLayout
 
 from front.widgets.filterControls import FilterControls
@@ -6,6 +6,9 @@ from front.widgets.filterControls import FilterControls
 
 class FilterPanel(QFrame):
 
+    # The search is only run once the user stopped typing for this delay
+    SEARCH_DEBOUNCE_MS = 150
+
     search_text_changed = Signal(str)
 
     def __init__(self):
@@ -19,9 +22,17 @@ class FilterPanel(QFrame):
         # Search Bar
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Search...")
-        self.search_bar.textChanged.connect(self.search_text_changed)
+        self.search_bar.textChanged.connect(self._search_timer_restart)
         self.search_bar.setStyleSheet("QLineEdit { padding: 5px; }")
         filter_layout.addWidget(self.search_bar)
 
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(lambda: self.search_text_changed.emit(self.search_bar.text()))
+
         self.filter_controls = FilterControls()
-        filter_layout.addLayout(self.filter_controls)
\ No newline at end of file
+        filter_layout.addLayout(self.filter_controls)
+
+    def _search_timer_restart(self, *_):
+        self._search_timer.start()
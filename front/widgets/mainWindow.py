@@ -1,28 +1,31 @@
-import json
 from datetime import datetime
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QPushButton
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from PySide6.QtCore import Qt, QModelIndex
 
 from front.column_width import ColumnWidth
+from front.throttled_call import ThrottledCall
 from front.widgets.RequestsDialog import RequestsDialog
-from front.widgets.customScrollArea import CustomScrollArea
 from front.widgets.customTitleBar import CustomTitleBar
 from front.widgets.filterPanel import FilterPanel
 from front.widgets.footerLayout import FooterLayout
-from front.widgets.cardItem import CardItem
+from front.widgets.serverActions import ServerActions
+from front.widgets.serverItemDelegate import ServerItemDelegate
+from front.widgets.serversListView import ServersListView
+from front.widgets.serversFilterProxyModel import ServersFilterProxyModel
+from front.widgets.serversTableModel import SERVER_ROLE, ServersTableModel
 from infrastructure.shared_models.shared_clusterView import SharedClusterView
 from infrastructure.shared_models.shared_isMaster import SharedIsMaster
 from infrastructure.shared_models.shared_serversData import SharedServersData
 from infrastructure.shared_models.shared_userRequests import SharedUserRequests
+from models.changeSet import ChangeSet
 from models.filterState import FilterState
 from models.serversData import ServersData
 
-
-# TODO perform multiple threading to get all servers at once (10 by 10)
-# TODO Add sync button for each server (don't make the last update globally) and use this generic function for SSH requests with threads
-
 class MainWindow(QWidget):
+    # Minimal delay between two refreshes of the servers list
+    UPDATE_INTERVAL_MS = 250
+
     def __init__(self, shared_servers: SharedServersData, shared_cluster: SharedClusterView, shared_requests: SharedUserRequests, shared_master: SharedIsMaster, is_admin: bool):
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -31,7 +34,6 @@ class MainWindow(QWidget):
         main_layout.setContentsMargins(0, 10, 0, 0)
 
         self.is_admin = is_admin
-        self.previous_data: ServersData | None = None
 
         title_bar = CustomTitleBar(self.is_admin, self)
         main_layout.addWidget(title_bar)
@@ -77,22 +79,31 @@ class MainWindow(QWidget):
         # sort_mode: 0 = no sort, 1 = ascending, 2 = descending
         self.sort_mode: int = 0
 
-        self.scroll = CustomScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setSpacing(10)
-        self.scroll_layout.setAlignment(Qt.AlignTop)
-        self.items: list[tuple[QFrame, CardItem]] = []
-        self.scroll.setWidget(self.scroll_content)
-        main_layout.addWidget(self.scroll)
+        # Actions on the servers, available to the admins of the master or sent as requests
+        self.actions = ServerActions(shared_servers, shared_requests, shared_master, is_admin, self)
+
+        # The servers are shown by a model/view list: only the visible rows are painted, as cards
+        self.servers_model = ServersTableModel(self)
+        # Rows matching the search bar and the filter controls
+        self.filter_proxy = ServersFilterProxyModel(self)
+        self.filter_proxy.setSourceModel(self.servers_model)
+        self.servers_view = ServersListView(ServerItemDelegate(lambda: self.actions.can_perform_action, self))
+        self.servers_view.setModel(self.filter_proxy)
+        self.servers_view.reservation_clicked.connect(self.on_reservation_clicked)
+        self.servers_view.refresh_clicked.connect(self.on_refresh_clicked)
+        self.actions.refresh_finished.connect(self.servers_view.stop_refresh)
+        main_layout.addWidget(self.servers_view)
 
         # Footer layout
         self.footer_frame = FooterLayout(self, shared_master)
         main_layout.addWidget(self.footer_frame)
 
         self.shared_servers = shared_servers
-        self.shared_servers.dataChanged.connect(self.update_items)
+        # Bursts of network updates are merged, so the list is refreshed at most once per interval
+        self.update_items_throttle = ThrottledCall(self.update_items, self.UPDATE_INTERVAL_MS, self)
+        # Changes received between two refreshes, None when the whole list must be compared again
+        self._pending_changes: ChangeSet | None = None
+        self.shared_servers.changed.connect(self.on_servers_changed)
         # When the servers data is being updated in the back, update also the front
 
         self.shared_is_master = shared_master
@@ -118,118 +129,48 @@ class MainWindow(QWidget):
         else:
             self.since_arrow.setText("▼")
 
-        self.update_items(force=True)
+        # The proxy only reorders its index of the rows
+        self.filter_proxy.set_sort_mode(self.sort_mode)
 
-    def update_items(self, force=False):
+    def on_servers_changed(self, changes: ChangeSet):
+        if self._pending_changes is None:
+            self._pending_changes = ChangeSet()
+        self._pending_changes.merge(changes)
+        self.update_items_throttle.trigger()
+
+    def update_items(self):
         servers_data: ServersData = self.shared_servers.data
+        changes, self._pending_changes = self._pending_changes, None
 
-        # 1) If there's no list or it's empty, do nothing (and clear previous_data)
+        # 1) If there's no list or it's empty, clear the list
         if not hasattr(servers_data, "servers_list") or not servers_data.servers_list:
             print("There is no loaded data, ignoring update.")
-            # Prevent any future clone() calls until we have data
-            self.previous_data = None
+            self.servers_model.set_servers([])
             return
 
         # 2) Now that we know we have a proper list, update the footer
         self.refresh_last_update(servers_data.last_update)
 
-        # 3) First-ever build or force-rebuild?
-        if self.previous_data is None or force:
-            self._full_rebuild(servers_data)
-            return
-
-        # --- here follows your “patch-only-the-changed-rows” logic ---
-        prev_map = {e.host: e.to_dict() for e in self.previous_data.servers_list}
-        curr_map = {e.host: e.to_dict() for e in servers_data.servers_list}
-
-        # 4) Sort current snapshot
-        data_list = list(servers_data.servers_list)
-        if self.sort_mode == 1:
-            data_list.sort(key=lambda s: s.since)
-        elif self.sort_mode == 2:
-            data_list.sort(key=lambda s: s.since, reverse=True)
-
-        # 5) Compare whole snapshot quickly
-        curr_str = json.dumps([e.to_dict() for e in data_list], sort_keys=True)
-        prev_str = json.dumps([e.to_dict() for e in self.previous_data.servers_list], sort_keys=True)
-        if curr_str == prev_str and not force:
+        # 3) The model only notifies the view about the rows that changed, which are the only ones repainted
+        if changes is None or changes.full or len(servers_data.servers_list) != self.servers_model.rowCount():
+            changed_rows = self.servers_model.set_servers(list(servers_data.servers_list))
+        else:
+            # Only the rows of the hosts named by the change set are patched
+            changed_rows = self.servers_model.update_hosts(servers_data.servers_list, changes.changed_servers)
+        if not changed_rows:
             print("No modification. Items remaining untouched.")
             return
 
-        print("A modification has been detected. Patching changed rows.")
-
-        # 7) For each changed host, replace its row in place
-        for idx, (frame, card) in enumerate(self.items):
-            host = card.host
-            if curr_map.get(host) != prev_map.get(host):
-                # remove old
-                self.scroll_layout.takeAt(idx)
-                frame.deleteLater()
-
-                # find new entry object
-                entry = next(e for e in servers_data.servers_list if e.host == host)
-
-                # create new frame+card
-                new_frame = QFrame()
-                new_frame.setFrameShape(QFrame.StyledPanel)
-                new_frame.setObjectName("cardFrame")
-                layout = QVBoxLayout(new_frame)
-                layout.setContentsMargins(5, 2, 5, 2)
-
-                new_card = CardItem(entry.host, entry.app, entry.status, entry.env, entry.available, entry.reservation,
-                    entry.since, entry.comment, self.is_admin, self.shared_is_master.data, self.shared_servers,
-                    self.shared_requests)
-                layout.addWidget(new_card)
-
-                # insert it back
-                self.scroll_layout.insertWidget(idx, new_frame)
-                self.items[idx] = (new_frame, new_card)
-
-        # 8) Finally, update previous_data **after** we’ve successfully iterated
-        self.previous_data = servers_data.clone()
-
-        # 9) Re-apply filters so the patched rows show/hide correctly
-        self.filter_items(self.filter_panel.search_bar.text())
-        self.filter_control_items(self.filter_panel.filter_controls.current_filters)
-
-    def _full_rebuild(self, servers_data: ServersData):
-        """Tear down everything and rebuild from scratch."""
-        # 1) Clear all existing rows
-        while self.scroll_layout.count():
-            w = self.scroll_layout.takeAt(0).widget()
-            if w:
-                w.deleteLater()
-        self.items.clear()
-
-        # 2) Sort
-        data_list = list(servers_data.servers_list)
-        if self.sort_mode == 1:
-            data_list.sort(key=lambda s: s.since)
-        elif self.sort_mode == 2:
-            data_list.sort(key=lambda s: s.since, reverse=True)
-
-        # 3) Build every row
-        for entry in data_list:
-            frame = QFrame()
-            frame.setFrameShape(QFrame.StyledPanel)
-            frame.setObjectName("cardFrame")
-            layout = QVBoxLayout(frame)
-            layout.setContentsMargins(5, 2, 5, 2)
-
-            card = CardItem(entry.host, entry.app, entry.status, entry.env, entry.available, entry.reservation,
-                entry.since, entry.comment, self.is_admin, self.shared_is_master.data, self.shared_servers,
-                self.shared_requests)
-            layout.addWidget(card)
-
-            self.scroll_layout.addWidget(frame)
-            self.items.append((frame, card))
-
-        # 4) Only now that build succeeded do we snapshot
-        self.previous_data = servers_data.clone()
-
-        # 5) Apply filters
-        self.filter_items(self.filter_panel.search_bar.text())
-        self.filter_control_items(self.filter_panel.filter_controls.current_filters)
+        # The proxy filters the changed rows again, and moves them if their sort value changed, by itself
+        print(f"A modification has been detected. Patching {len(changed_rows)} changed rows.")
+
+    def on_reservation_clicked(self, index: QModelIndex):
+        self.actions.open_reservation_dialog(index.data(SERVER_ROLE))
+
+    def on_refresh_clicked(self, index: QModelIndex):
+        host = index.data(SERVER_ROLE).host
+        self.servers_view.start_refresh(host)
+        self.actions.refresh(host)
 
     def refresh_last_update(self, last_update):
         readable_date = datetime.fromtimestamp(last_update)
@@ -237,15 +178,10 @@ class MainWindow(QWidget):
         self.footer_frame.label_last_update.setText("Last update time: " + formatted_date)
 
     def filter_items(self, text):
-        q = text.lower()
-        for card, item in self.items:
-            card.setVisible(
-                item.matches(q) and item.matches_conditions(self.filter_panel.filter_controls.current_filters))
+        self.filter_proxy.set_query(text)
 
     def filter_control_items(self, state: FilterState):
-        for card, item in self.items:
-            card.setVisible(
-                item.matches_conditions(state) and item.matches(self.filter_panel.search_bar.text().lower()))
+        self.filter_proxy.set_filter_state(state)
 
     def show_requests_dialog(self):
         dlg = RequestsDialog(self.shared_servers, self.shared_requests, self.is_admin, self.shared_is_master.data, parent=self)
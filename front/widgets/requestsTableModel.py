@@ -0,0 +1,95 @@
+from datetime import datetime
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from models.changeSet import ChangeSet
+from models.userRequest import UserRequest
+
+# Role returning the whole UserRequest of a row, used by the delegate of the Accept action
+REQUEST_ROLE = Qt.UserRole + 1
+
+
+class RequestsTableModel(QAbstractTableModel):
+    """
+    Table of the pending user requests, in the order of the shared requests.
+    A change set only inserts and removes the rows of the requests it names, the other rows are left untouched.
+    """
+
+    COLUMNS = ("User", "Time", "Available", "Host", "Comment", "Action")
+    USER, TIME, AVAILABLE, HOST, COMMENT, ACTION = range(len(COLUMNS))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._requests: list[UserRequest] = []
+
+    def set_requests(self, requests: list[UserRequest]):
+        self.beginResetModel()
+        self._requests = list(requests)
+        self.endResetModel()
+
+    def apply_changes(self, requests: list[UserRequest], changes: ChangeSet):
+        """
+        Remove the rows of the removed requests and append the added ones.
+        Falls back to a reset when the rows don't follow the given requests anymore.
+        """
+        if changes.full:
+            self.set_requests(requests)
+            return
+
+        removed_keys = {request.key() for request in changes.removed_requests}
+        # From the last row, so the rows still to remove keep their position
+        for row in reversed(range(len(self._requests))):
+            if self._requests[row].key() in removed_keys:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._requests[row]
+                self.endRemoveRows()
+
+        if changes.added_requests:
+            first = len(self._requests)
+            self.beginInsertRows(QModelIndex(), first, first + len(changes.added_requests) - 1)
+            self._requests.extend(changes.added_requests)
+            self.endInsertRows()
+
+        if [request.key() for request in self._requests] != [request.key() for request in requests]:
+            self.set_requests(requests)
+
+    def request(self, row: int) -> UserRequest:
+        return self._requests[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._requests)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        request = self._requests[index.row()]
+        if role == REQUEST_ROLE:
+            return request
+        if role == Qt.DisplayRole:
+            return self.display_text(request, index.column())
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    @classmethod
+    def display_text(cls, request: UserRequest, column: int) -> str:
+        if column == cls.USER:
+            return request.user
+        if column == cls.TIME:
+            return datetime.fromtimestamp(request.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        if column == cls.AVAILABLE:
+            return "Yes" if request.available else "No"
+        if column == cls.HOST:
+            return request.host
+        if column == cls.COMMENT:
+            return request.comment
+        return ""
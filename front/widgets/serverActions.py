@@ -0,0 +1,111 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QMessageBox
+
+from front.utils import free_server, book_server
+from front.widgets.freeServerDialog import FreeServerDialog
+from front.widgets.serverBookingDialog import ServerBookingDialog
+from infrastructure.shared_models.shared_isMaster import SharedIsMaster
+from infrastructure.shared_models.shared_serversData import SharedServersData
+from infrastructure.shared_models.shared_userRequests import SharedUserRequests
+from models.serverElement import ServerElement
+from models.userRequest import UserRequest
+
+
+class ServerActions(QObject):
+    """
+    Actions available on a server of the list: book it, free it, or refresh it.
+    Admins of the master act directly on the servers, the other users send a request instead.
+    """
+
+    refresh_finished = Signal(str)
+
+    def __init__(self, shared_servers: SharedServersData, shared_users_requests: SharedUserRequests,
+                 shared_master: SharedIsMaster, is_admin: bool, parent=None):
+        super().__init__(parent)
+        self.shared_servers: SharedServersData = shared_servers
+        self.shared_users_requests: SharedUserRequests = shared_users_requests
+        self.shared_is_master: SharedIsMaster = shared_master
+        self.is_admin: bool = is_admin
+
+    @property
+    def can_perform_action(self) -> bool:
+        return self.is_admin and bool(self.shared_is_master.data)
+
+    def refresh(self, host: str):
+        """Poll the host again on a background thread, refresh_finished is emitted when done."""
+        threading.Thread(target=self._run_refresh, args=(host,), daemon=True).start()
+
+    def _run_refresh(self, host: str):
+        try:
+            # The list is updated by the dataChanged signal of the servers
+            self.shared_servers.refresh_host(host)
+        except RuntimeError:
+            pass
+        finally:
+            self.refresh_finished.emit(host)
+
+    def open_reservation_dialog(self, entry: ServerElement):
+        if not entry.available:
+            self.open_free_dialog(entry)
+        else:
+            self.open_booking_dialog(entry)
+
+    def open_free_dialog(self, entry: ServerElement):
+        if not self.can_perform_action:
+            result = QMessageBox.question(None, "Permission required",
+                                          "You cannot free the server directly.\nDo you want to send a request instead?",
+                                          QMessageBox.Yes | QMessageBox.No)
+            if result != QMessageBox.Yes:
+                print("User cancelled the request.")
+                return
+
+        dialog = FreeServerDialog(entry.host, entry.comment)
+        if dialog.exec():
+            try:
+                if self.can_perform_action:
+                    with self.shared_servers.mutate() as servers_data:
+                        free_server(servers_data, entry.host, dialog.comment_edit.text())
+                    print("User confirmed to free the server.")
+                else:
+                    self.request_free_server(entry.host, dialog.comment_edit.text())
+                    print("User requested to free the server.")
+
+            except RuntimeError:
+                QMessageBox.critical(None, "Item Modified", "This server's data has changed during the operation.\n"
+                                                            "Please try again.")
+        else:
+            print("User cancelled the action.")
+
+    def open_booking_dialog(self, entry: ServerElement):
+        if not self.can_perform_action:
+            result = QMessageBox.question(None, "Permission required",
+                                          "You cannot book this server directly.\nDo you want to send a booking request instead?",
+                                          QMessageBox.Yes | QMessageBox.No)
+            if result != QMessageBox.Yes:
+                print("User cancelled the request.")
+                return
+
+        dialog = ServerBookingDialog(entry.host, entry.comment)
+        if dialog.exec():
+            try:
+                booking_data = dialog.booking_data()
+                if self.can_perform_action:
+                    with self.shared_servers.mutate() as servers_data:
+                        book_server(servers_data, booking_data.host_name, booking_data.user, booking_data.comment)
+                    print("User booked server")
+                else:
+                    self.request_book_server(entry.host, booking_data)
+                    print("User requested to book the server.")
+
+            except RuntimeError:
+                QMessageBox.critical(None, "Item Modified", "This server's data has changed during the operation.\n"
+                                                            "Please try again.")
+
+    def request_free_server(self, host, comment):
+        self.shared_users_requests.submit(UserRequest(timestamp=time.time(), available=True, host=host, user="", comment=comment))
+
+    def request_book_server(self, host, booking_data):
+        self.shared_users_requests.submit(UserRequest(timestamp=time.time(), available=False, host=host, user=booking_data.user, comment=booking_data.comment))
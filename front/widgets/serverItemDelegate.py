@@ -0,0 +1,129 @@
+from typing import Callable
+
+from PySide6.QtCore import QPoint, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPixmap, QTransform
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+from front.column_width import ColumnWidth
+from front.widgets.serversTableModel import SERVER_ROLE, ServersTableModel, reservation_text
+from models.serverElement import ServerElement
+
+
+class ServerItemDelegate(QStyledItemDelegate):
+    """
+    Paint a whole row of the servers model as a card, with the same look as the former card widgets: a rounded
+    frame, the fields in fixed width columns, the reservation button and, for the admins of the master, the refresh
+    button. Only the visible rows are painted, no widget is created per row.
+    """
+
+    ROW_HEIGHT = 54
+    CARD_MARGIN = 4
+    CONTENT_MARGIN = 16
+    SPACING = 10
+    BUTTON_HEIGHT = 30
+    REFRESH_SIZE = 24
+
+    # Colors of the stylesheet
+    CARD_BACKGROUND = QColor("#3c3f41")
+    CARD_BORDER = QColor("#555555")
+    TEXT_COLORS = {True: QColor("#b9f6ca"), False: QColor("#ffcdd2")}
+    DEFAULT_TEXT_COLOR = QColor("#DDDDDD")
+    BUTTON_COLORS = {True: (QColor("#388e3c"), QColor("#4caf50")), False: (QColor("#d32f2f"), QColor("#f44336"))}
+    DEFAULT_BUTTON_COLORS = (QColor("#4e5254"), QColor("#64686a"))
+
+    LABEL_COLUMNS = ((ServersTableModel.HOST, ColumnWidth.HOST), (ServersTableModel.APP, ColumnWidth.APP),
+                     (ServersTableModel.STATUS, ColumnWidth.IP), (ServersTableModel.ENV, ColumnWidth.ENV),
+                     (ServersTableModel.AVAILABLE, ColumnWidth.AVAILABLE))
+
+    def __init__(self, can_refresh: Callable[[], bool], parent=None):
+        super().__init__(parent)
+        self.can_refresh = can_refresh
+        self.hover_pos: QPoint | None = None
+        self.refreshing_hosts: set[str] = set()
+        self.refresh_angle: int = 0
+        self._refresh_pix = QPixmap(":/icons/images/icons/cil-reload.png")
+
+    def sizeHint(self, option: QStyleOptionViewItem, index):
+        return QSize(self._content_width(), self.ROW_HEIGHT)
+
+    def _content_width(self) -> int:
+        width = sum(width for _, width in self.LABEL_COLUMNS) + ColumnWidth.RESERVATION + ColumnWidth.FROM
+        width += self.SPACING * (len(self.LABEL_COLUMNS) + 2) + self.REFRESH_SIZE
+        return width + 2 * (self.CARD_MARGIN + self.CONTENT_MARGIN)
+
+    def _card_rect(self, row_rect: QRect) -> QRect:
+        return row_rect.adjusted(self.CARD_MARGIN, self.CARD_MARGIN, -self.CARD_MARGIN, -self.CARD_MARGIN)
+
+    def _cells(self, row_rect: QRect) -> tuple[list[tuple[int, QRect]], QRect, QRect, QRect]:
+        """
+        :return: the rect of every label column, of the reservation button, of the since column, and of the
+                 refresh button
+        """
+        card = self._card_rect(row_rect)
+        x = card.left() + self.CONTENT_MARGIN
+        labels = []
+        for column, width in self.LABEL_COLUMNS:
+            labels.append((column, QRect(x, card.top(), width, card.height())))
+            x += width + self.SPACING
+
+        button = QRect(x, card.center().y() - self.BUTTON_HEIGHT // 2, ColumnWidth.RESERVATION, self.BUTTON_HEIGHT)
+        x += ColumnWidth.RESERVATION + self.SPACING
+        since = QRect(x, card.top(), ColumnWidth.FROM, card.height())
+        x += ColumnWidth.FROM + self.SPACING
+        refresh = QRect(x, card.center().y() - self.REFRESH_SIZE // 2, self.REFRESH_SIZE, self.REFRESH_SIZE)
+        return labels, button, since, refresh
+
+    def reservation_button_rect(self, row_rect: QRect) -> QRect:
+        return self._cells(row_rect)[1]
+
+    def refresh_button_rect(self, row_rect: QRect) -> QRect | None:
+        return self._cells(row_rect)[3] if self.can_refresh() else None
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index):
+        entry: ServerElement = index.data(SERVER_ROLE)
+        if entry is None:
+            return
+
+        labels, button, since, refresh = self._cells(option.rect)
+        metrics = option.fontMetrics
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card frame
+        painter.setPen(QPen(self.CARD_BORDER))
+        painter.setBrush(self.CARD_BACKGROUND)
+        painter.drawRoundedRect(self._card_rect(option.rect), 15, 15)
+
+        # Labels
+        painter.setPen(self.TEXT_COLORS.get(entry.available, self.DEFAULT_TEXT_COLOR))
+        for column, rect in labels + [(ServersTableModel.SINCE, since)]:
+            text = ServersTableModel.display_text(entry, column)
+            text_rect = rect.adjusted(2, 0, -2, 0)
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                             metrics.elidedText(text, Qt.ElideRight, text_rect.width()))
+
+        # Reservation button, showing the action when hovered
+        hovered = self.hover_pos is not None and button.contains(self.hover_pos)
+        normal, hover = self.BUTTON_COLORS.get(entry.available, self.DEFAULT_BUTTON_COLORS)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(hover if hovered else normal)
+        painter.drawRoundedRect(button, 4, 4)
+
+        if hovered:
+            text = "Free server" if not entry.available else "Book it!"
+        else:
+            text = reservation_text(entry)
+        painter.setPen(QColor("white"))
+        painter.drawText(button, Qt.AlignCenter, metrics.elidedText(text, Qt.ElideRight, button.width() - 8))
+
+        # Refresh button, spinning while the host is being polled
+        if self.can_refresh():
+            pix = self._refresh_pix
+            if entry.host in self.refreshing_hosts:
+                pix = pix.transformed(QTransform().rotate(self.refresh_angle), Qt.SmoothTransformation)
+            target = QRect(0, 0, self.REFRESH_SIZE, self.REFRESH_SIZE)
+            target.moveCenter(refresh.center())
+            painter.drawPixmap(target, pix.scaled(target.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+        painter.restore()
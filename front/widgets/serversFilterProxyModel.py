@@ -0,0 +1,75 @@
+from PySide6.QtCore import QSortFilterProxyModel, Qt
+
+from front.server_filter import compile_conditions
+from front.widgets.serversTableModel import SORT_ROLE, ServersTableModel
+from models.filterState import FilterState
+
+
+class ServersFilterProxyModel(QSortFilterProxyModel):
+    """
+    Rows of the servers model matching the search query and the filter controls, in the order of the sort mode.
+
+    Rows are matched against the search index of the model. When the query extends the previous one, only the rows
+    that matched the previous query are searched again. The rows changed in the source model are filtered again on
+    their own, since the proxy follows the dataChanged signals of the source.
+
+    The proxy keeps a sorted index of the rows: changing the sort mode reorders it without touching the source, and
+    a row whose value changed is moved alone to its new position.
+    """
+
+    # sort_mode: 0 = no sort, 1 = ascending, 2 = descending
+    NO_SORT, ASCENDING, DESCENDING = range(3)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._query: str = ""
+        self._conditions = []
+        self._text_matches: set[int] = set()  # Source rows matching the current query
+        self._candidates: set[int] | None = None  # Only set while filtering again for a new query
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def setSourceModel(self, model: ServersTableModel):
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self._clear_text_matches)
+
+    def _clear_text_matches(self):
+        self._text_matches = set()
+
+    def set_query(self, query: str):
+        query = query.lower()
+        if query == self._query:
+            return
+
+        if self._query and self._query in query:
+            # Narrowing: a row matching the new query also matched the previous one
+            self._candidates = self._text_matches
+        self._query = query
+        self._text_matches = set()
+        try:
+            self.invalidateFilter()
+        finally:
+            self._candidates = None
+
+    def set_sort_mode(self, sort_mode: int):
+        if sort_mode == self.NO_SORT:
+            self.sort(-1)  # Back to the order of the source
+        else:
+            self.sort(ServersTableModel.SINCE, Qt.AscendingOrder if sort_mode == self.ASCENDING else Qt.DescendingOrder)
+
+    def set_filter_state(self, state: FilterState | None):
+        self._conditions = compile_conditions(state)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._candidates is not None and source_row not in self._candidates:
+            return False
+
+        row = self.sourceModel().search_row(source_row)
+        if self._query in row.key:
+            self._text_matches.add(source_row)
+        else:
+            self._text_matches.discard(source_row)
+            return False
+
+        return all(condition(row) for condition in self._conditions)
@@ -0,0 +1,73 @@
+from PySide6.QtCore import QModelIndex, QTimer, Signal
+from PySide6.QtGui import QWheelEvent
+from PySide6.QtWidgets import QAbstractItemView, QListView
+
+from front.widgets.serverItemDelegate import ServerItemDelegate
+
+
+class ServersListView(QListView):
+    """
+    Virtualized list of the servers: every row is painted by the delegate as a card, and only the visible rows are
+    painted. The clicks on the buttons painted in a row are forwarded as signals.
+    """
+
+    reservation_clicked = Signal(QModelIndex)
+    refresh_clicked = Signal(QModelIndex)
+
+    def __init__(self, delegate: ServerItemDelegate, parent=None):
+        super().__init__(parent)
+        self.delegate = delegate
+        self.setItemDelegate(delegate)
+        self.setUniformItemSizes(True)  # Lets the view lay out thousands of rows without measuring them
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.setObjectName("serversList")
+
+        # Timer for spinning the refresh buttons
+        self._spin_timer = QTimer(self)
+        self._spin_timer.setInterval(50)
+        self._spin_timer.timeout.connect(self._rotate_refresh)
+
+    def start_refresh(self, host: str):
+        self.delegate.refreshing_hosts.add(host)
+        self._spin_timer.start()
+
+    def stop_refresh(self, host: str):
+        self.delegate.refreshing_hosts.discard(host)
+        if not self.delegate.refreshing_hosts:
+            self._spin_timer.stop()
+        self.viewport().update()
+
+    def _rotate_refresh(self):
+        self.delegate.refresh_angle = (self.delegate.refresh_angle + 20) % 360
+        self.viewport().update()
+
+    def mouseMoveEvent(self, event):
+        # The delegate shows the hover text of the reservation button under the mouse
+        self.delegate.hover_pos = event.position().toPoint()
+        self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.delegate.hover_pos = None
+        self.viewport().update()
+        super().leaveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        pos = event.position().toPoint()
+        index = self.indexAt(pos)
+        if index.isValid():
+            row_rect = self.visualRect(index)
+            refresh_rect = self.delegate.refresh_button_rect(row_rect)
+            if self.delegate.reservation_button_rect(row_rect).contains(pos):
+                self.reservation_clicked.emit(index)
+            elif refresh_rect is not None and refresh_rect.contains(pos):
+                self.refresh_clicked.emit(index)
+        super().mouseReleaseEvent(event)
+
+    def wheelEvent(self, event: QWheelEvent):
+        delta = event.angleDelta().y() // 8
+        self.verticalScrollBar().setValue(
+            self.verticalScrollBar().value() - delta)
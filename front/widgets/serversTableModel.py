@@ -0,0 +1,147 @@
+from datetime import datetime
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from front.server_filter import SearchRow, build_search_row
+from front.utils import seconds_to_elapsed
+from models.serverElement import ServerElement
+
+# Role returning the whole ServerElement of a row, used by the delegate to paint the row as a card
+SERVER_ROLE = Qt.UserRole + 1
+# Role returning the raw value of a field, used to sort the rows
+SORT_ROLE = Qt.UserRole + 2
+
+
+class ServersTableModel(QAbstractTableModel):
+    """
+    Table of the servers, one row per server in the order given to set_servers(), one column per field.
+    The model keeps references to the servers of the published snapshots, which are never modified in place.
+    """
+
+    COLUMNS = ("Host", "App", "Status", "Env", "Available", "Reservation", "Since")
+    HOST, APP, STATUS, ENV, AVAILABLE, RESERVATION, SINCE = range(len(COLUMNS))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._servers: list[ServerElement] = []
+        # Fingerprint of every row, to notify the view only about the rows that changed
+        self._fingerprints: list[tuple] = []
+        # Lowercased fields of every row, searched by the filter
+        self._search_rows: list[SearchRow] = []
+        # Rows of every host, to patch the rows named by a change set without scanning the list
+        self._rows_by_host: dict[str, list[int]] = {}
+
+    def set_servers(self, servers_list: list[ServerElement]) -> list[int]:
+        """
+        Show the given servers. Rows are identified by their position, so duplicated hosts get a row each.
+        :return: the rows that changed, every row if the number of servers changed
+        """
+        if len(servers_list) != len(self._servers):
+            self.beginResetModel()
+            self._servers = list(servers_list)
+            self._fingerprints = [entry.fingerprint() for entry in self._servers]
+            self._search_rows = [build_search_row(entry) for entry in self._servers]
+            self._index_hosts()
+            self.endResetModel()
+            return list(range(len(self._servers)))
+
+        changed_rows = []
+        hosts_moved = False
+        for row, entry in enumerate(servers_list):
+            fingerprint = entry.fingerprint()
+            if fingerprint != self._fingerprints[row]:
+                hosts_moved |= entry.host != self._servers[row].host
+                self._servers[row] = entry
+                self._fingerprints[row] = fingerprint
+                self._search_rows[row] = build_search_row(entry)
+                changed_rows.append(row)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+        if hosts_moved:
+            self._index_hosts()
+        # The other rows may only differ by their poll time, which is not painted but read by the tooltips
+        self._servers = list(servers_list)
+        return changed_rows
+
+    def _index_hosts(self):
+        self._rows_by_host = {}
+        for row, entry in enumerate(self._servers):
+            self._rows_by_host.setdefault(entry.host, []).append(row)
+
+    def update_hosts(self, servers_list: list[ServerElement], hosts) -> list[int]:
+        """
+        Patch only the rows of the given hosts, the other rows are known to be unchanged.
+        The servers list must have the same rows as the one shown, in the same order.
+        :return: the rows that changed
+        """
+        # The other rows may only differ by their poll time, which is not painted but read by the tooltips
+        self._servers = list(servers_list)
+        changed_rows = []
+        for host in hosts:
+            for row in self._rows_by_host.get(host, []):
+                entry = servers_list[row]
+                self._fingerprints[row] = entry.fingerprint()
+                self._search_rows[row] = build_search_row(entry)
+                changed_rows.append(row)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+        return changed_rows
+
+    def server(self, row: int) -> ServerElement:
+        return self._servers[row]
+
+    def search_row(self, row: int) -> SearchRow:
+        return self._search_rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._servers)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        entry = self._servers[index.row()]
+        if role == SERVER_ROLE:
+            return entry
+        if role == Qt.DisplayRole:
+            return self.display_text(entry, index.column())
+        if role == SORT_ROLE:
+            return entry.since if index.column() == self.SINCE else self.display_text(entry, index.column())
+        if role == Qt.ToolTipRole:
+            return self.tooltip(entry)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    @classmethod
+    def display_text(cls, entry: ServerElement, column: int) -> str:
+        if column == cls.HOST:
+            return entry.host
+        if column == cls.APP:
+            return entry.app
+        if column == cls.STATUS:
+            return entry.status
+        if column == cls.ENV:
+            return entry.env
+        if column == cls.AVAILABLE:
+            return str(entry.available)
+        if column == cls.RESERVATION:
+            return reservation_text(entry)
+        return seconds_to_elapsed(entry.since) if entry.since != -1 else ""
+
+    @staticmethod
+    def tooltip(entry: ServerElement) -> str:
+        if not entry.last_update:
+            return entry.comment
+        polled = datetime.fromtimestamp(entry.last_update).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{entry.comment}\nLast polled: {polled}" if entry.comment else f"Last polled: {polled}"
+
+
+def reservation_text(entry: ServerElement) -> str:
+    return "Available" if entry.available == True else entry.reservation
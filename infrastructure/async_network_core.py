@@ -0,0 +1,312 @@
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from infrastructure.framed_socket import FrameReader, FramingError, decode_frame, encode_frames
+from infrastructure.ip_manager import IpManager
+from infrastructure.message_codec import JSON_CODEC, MessageCodec
+from infrastructure.message_deserializer import MessageDeserializer
+from infrastructure.messages.generalMessage import GeneralMessage
+from models.role import Role
+
+
+class AsyncFramedConnection:
+    """
+    Send side of a framed connection served by the event loop.
+    Sending is thread-safe: frames sent from another thread are handed over to the loop.
+    A peer whose backlog of unsent bytes exceeds max_buffer_size when a new message is written is disconnected: it
+    does not read fast enough, and would make the backlog grow without limit. 0 disables the limit.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, writer: asyncio.StreamWriter,
+                 codec: MessageCodec = JSON_CODEC, chunk_size: int = 0, compress_min_size: int = 0,
+                 max_buffer_size: int = 0):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.loop = loop
+        self.writer = writer
+        self.codec = codec
+        self.chunk_size = chunk_size
+        self.compress_min_size = compress_min_size
+        self.max_buffer_size = max_buffer_size
+
+    def send_message(self, message: GeneralMessage):
+        codec = self.codec
+        self.send_frame(codec.encode(message.to_dict()), codec.codec_id)
+
+    def send_frame(self, payload: bytes, codec_id: int = JSON_CODEC.codec_id):
+        if self.writer.is_closing():
+            raise ConnectionResetError("Connection already closed")
+
+        self.send_encoded(encode_frames(payload, codec_id, self.chunk_size, self.compress_min_size))
+
+    def send_encoded(self, frames: bytes | memoryview, timeout: float | None = None):
+        """
+        :param timeout: ignored, writing never blocks the loop. A peer not taking the frames is disconnected once its
+        backlog reaches max_buffer_size instead
+        """
+        if self.writer.is_closing():
+            raise ConnectionResetError("Connection already closed")
+
+        if self._in_loop_thread():
+            self._write(frames)
+        else:
+            self.loop.call_soon_threadsafe(self._write, frames)
+
+    def _write(self, frames: bytes | memoryview):
+        if self.writer.is_closing():
+            return
+
+        transport = self.writer.transport
+        if self.max_buffer_size and transport.get_write_buffer_size() > self.max_buffer_size:
+            self.logger.warning(f"Client {self.writer.get_extra_info('peername')[0]} is too far behind "
+                                f"({transport.get_write_buffer_size()} bytes not sent). Disconnecting.")
+            # Dropping the backlog, the slave fetches the whole state again when it reconnects
+            transport.abort()
+            return
+
+        self.writer.write(frames)
+
+    def _in_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def close(self):
+        if self._in_loop_thread():
+            self.writer.close()
+        else:
+            self.loop.call_soon_threadsafe(self.writer.close)
+
+
+class _UdpListenerProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, core: "AsyncNetworkCore"):
+        self.core = core
+
+    def datagram_received(self, data: bytes, addr):
+        self.core.on_datagram(data, addr[0])
+
+
+class AsyncNetworkCore:
+    """
+    Event-loop backend of the network tasks of a User.
+
+    The UDP listener, and while the user is the master the TCP server, the heartbeat sender, the state publisher and
+    the data saver, all run on a single asyncio loop with non-blocking sockets, instead of one thread each plus one
+    thread per slave. The message handling itself is delegated to the User, and the shared models are updated from
+    the loop thread: Qt queues their signals to the receivers living in the GUI thread.
+    """
+
+    def __init__(self, user):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.user = user
+        self.config = user.config
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.loop_thread: threading.Thread | None = None
+        self.udp_transport: asyncio.DatagramTransport | None = None
+        self.master_future = None
+        self.last_datagram: float = 0
+
+        # UDP messages may trigger blocking role changes, they are handled in order outside the loop
+        self.udp_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="udp-handler")
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.loop_thread.start()
+
+    def _run_loop(self):
+        self.logger.info(f"Thread <EVENT_LOOP> started!")
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._start_udp_listener())
+        self.loop.run_forever()
+
+        # Let the cancelled tasks run their cleanup before closing the loop
+        pending = asyncio.all_tasks(self.loop)
+        self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+        self.logger.info(f"Thread <EVENT_LOOP> is shutting down")
+
+    def stop(self):
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        self.loop.call_soon_threadsafe(self._stop_loop)
+        self.loop_thread.join(1)
+        self.udp_executor.shutdown(wait=False)
+
+    def _stop_loop(self):
+        if self.udp_transport is not None:
+            self.udp_transport.close()
+        for task in asyncio.all_tasks(self.loop):
+            task.cancel()
+        self.loop.stop()
+
+    def start_master(self):
+        if self.master_future is not None and not self.master_future.done():
+            self.logger.warning(f"Master tasks were still running. This is not the right behavior...")
+            return
+
+        self.master_future = asyncio.run_coroutine_threadsafe(self._run_master(), self.loop)
+
+    # ----- UDP -----
+
+    async def _start_udp_listener(self):
+        self.logger.info(f"Task <UDP_LISTENER> started!")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.bind(('', self.config.UDP_PORT))
+        sock.setblocking(False)
+
+        self.udp_transport, _ = await self.loop.create_datagram_endpoint(lambda: _UdpListenerProtocol(self), sock=sock)
+        self.last_datagram = time.time()
+        self.loop.create_task(self._udp_watchdog())
+
+    def on_datagram(self, data: bytes, src_ip: str):
+        if IpManager.is_own_ip(src_ip):
+            return
+
+        self.last_datagram = time.time()
+        try:
+            msg = json.loads(data.decode())
+        except ValueError as e:
+            self.logger.error(f"Got an invalid UDP message from {src_ip}: {e}")
+            return
+
+        self.loop.run_in_executor(self.udp_executor, self.user.handle_udp, msg, src_ip)
+
+    async def _udp_watchdog(self):
+        timeout = self.config.HEARTBEAT_RETRIES * self.config.HEARTBEAT_INTERVAL / 1000
+
+        while True:
+            await asyncio.sleep(timeout - (time.time() - self.last_datagram))
+
+            if time.time() - self.last_datagram >= timeout:
+                self.logger.warning(f"Timed out waiting for UDP messages. Didn't got Heartbeat from master. Reinitializing connection.")
+                self.last_datagram = time.time()
+                self.loop.run_in_executor(self.udp_executor, self.user.restart_tcp_client)
+
+    def broadcast(self, message: GeneralMessage):
+        self.udp_transport.sendto(message.to_json().encode(), ('<broadcast>', self.config.UDP_PORT))
+
+    # ----- Master tasks -----
+
+    async def _run_master(self):
+        server = await asyncio.start_server(self._handle_client, host='', port=self.config.TCP_PORT,
+                                            family=socket.AF_INET)
+        self.logger.info(f'TCP server started')
+
+        tasks = [self.loop.create_task(self._heartbeat_sender()),
+                 self.loop.create_task(self._state_publisher()),
+                 self.loop.create_task(self._data_saver())]
+
+        try:
+            while not self.user.stop_master_event.is_set():
+                await asyncio.sleep(1)
+        finally:
+            server.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await server.wait_closed()
+            self.logger.info(f"Master tasks are shutting down")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client_ip = writer.get_extra_info("peername")[0]
+        connection = AsyncFramedConnection(self.loop, writer, chunk_size=self.config.FRAME_CHUNK_SIZE,
+                                           compress_min_size=self.config.FRAME_COMPRESSION_MIN_SIZE,
+                                           max_buffer_size=self.config.CLIENT_SEND_BUFFER_LIMIT)
+        frame_reader = FrameReader()
+        deserializer = MessageDeserializer()
+        self.logger.info(f'A new client connected at address {client_ip}')
+        with self.user.shared_cluster.mutate() as cluster_view:
+            cluster_view.add_or_update(client_ip, Role.SLAVE)
+
+        try:
+            while not self.user.stop_master_event.is_set():
+                try:
+                    data = await asyncio.wait_for(reader.read(65536), self.config.CLIENT_TCP_TIMEOUT / 1000)
+                except asyncio.TimeoutError:
+                    if self.user.state_publisher.is_subscribed(connection):
+                        continue  # Subscribed slaves only talk when they have a request to send
+
+                    self.logger.warning(f"Timed out waiting for data from client {client_ip}. Disconnecting.")
+                    break
+
+                if not data:  # Client closed cleanly
+                    self.logger.info(f"Client {client_ip} closed the connection.")
+                    break
+
+                for codec_id, frame in frame_reader.feed(data):
+                    try:
+                        # Answer the slave with the codec it uses
+                        connection.codec, msg = decode_frame(codec_id, frame)
+                        message = deserializer.deserialize(msg)
+                    except Exception as e:
+                        self.logger.error(f"Didn't succeed to handle message from the client: {e}")
+                        continue
+
+                    # Building and encoding the answer may compare and compress the whole state, keep it away from
+                    # the loop. The messages of a client are still handled in order
+                    await self.loop.run_in_executor(None, self.user.process_client_message, message, connection,
+                                                    client_ip)
+
+                # Read nothing more until the answers have been taken by the client
+                try:
+                    await asyncio.wait_for(writer.drain(), self.config.CLIENT_TCP_TIMEOUT / 1000)
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"Client {client_ip} does not read its answers. Disconnecting.")
+                    break
+
+        except (ConnectionResetError, OSError) as e:
+            self.logger.warning(f"Client {client_ip} disconnected abruptly: {e}")
+
+        except FramingError as e:
+            self.logger.error(f"Corrupted stream from client {client_ip}. Disconnecting: {e}")
+
+        except asyncio.CancelledError:
+            pass  # The loop is shutting down
+
+        finally:
+            self.user.state_publisher.unsubscribe(connection)
+            writer.close()
+            with self.user.shared_cluster.mutate() as cluster_view:
+                cluster_view.remove(client_ip)
+            self.logger.warning(f"Socket of client {client_ip} has been closed.")
+
+    async def _heartbeat_sender(self):
+        self.logger.info(f"Task <HEARTBEAT_SENDER> started!")
+
+        while True:
+            self.logger.info("Sending heartbeat broadcast")
+            # Capturing the state compares all its rows, keep it away from the loop
+            self.broadcast(await self.loop.run_in_executor(None, self.user.heartbeat_message))
+            await asyncio.sleep(self.config.HEARTBEAT_INTERVAL / 1000)
+
+    async def _state_publisher(self):
+        self.logger.info(f"Task <STATE_PUBLISHER> started!")
+        publisher = self.user.state_publisher
+
+        while True:
+            # Every change notified within the window is published at once
+            await asyncio.sleep(publisher.coalesce_interval)
+            if publisher.take_change():
+                # Capturing, comparing and encoding the state are done outside the loop, the frames are handed back
+                await self.loop.run_in_executor(None, publisher.publish)
+
+    async def _data_saver(self):
+        self.logger.info(f"Task <DATA_SAVER> started!")
+        save_dir = Path(self.config.SAVING_NETWORK_DIRECTORY)
+        await self.loop.run_in_executor(None, lambda: save_dir.mkdir(parents=True, exist_ok=True))
+
+        while True:
+            await asyncio.sleep(self.config.SAVING_INTERVAL / 1000)
+            # Writing to the network directory may block, keep it away from the loop
+            await self.loop.run_in_executor(None, self.user.save_server_data, save_dir)
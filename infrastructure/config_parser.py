@@ -6,19 +6,35 @@ class ConfigParser:
         tree = ET.parse('config.xml')
         root = tree.getroot()
 
+        self.NETWORK_BACKEND = root.find('NetworkBackend').text.strip().lower()
         self.UDP_PORT = int(root.find('UdpPort').text)
         self.TCP_PORT = int(root.find('TcpPort').text)
         self.FETCH_INTERVAL = int(root.find('FetchInterval').text)
+        self.STATE_SUBSCRIPTION = root.find('StateSubscription').text.strip().lower() == "true"
+        self.PUSH_COALESCE_INTERVAL = int(root.find('PushCoalesceInterval').text)
+        self.PUSH_SEND_TIMEOUT = int(root.find('PushSendTimeout').text)
+        self.WIRE_CODECS = [name.strip() for name in root.find('WireCodecs').text.split(',')]
+        self.FRAME_CHUNK_SIZE = int(root.find('FrameChunkSize').text)
+        self.FRAME_COMPRESSION_MIN_SIZE = int(root.find('FrameCompressionMinSize').text)
         self.HEARTBEAT_INTERVAL = int(root.find('HeartbeatInterval').text)
         self.HEARTBEAT_RETRIES = int(root.find('HeartbeatRetries').text)
         self.JOIN_NETWORK_INTERVAL = int(root.find('JoinNetworkInterval').text)
         self.JOIN_NETWORK_ATTEMPTS = int(root.find('JoinNetworkAttempts').text)
+        self.INTERFACES_REFRESH_INTERVAL = int(root.find('InterfacesRefreshInterval').text)
+        self.LAN_ADDRESS = (root.findtext('LanAddress') or "").strip()
         self.CLIENT_TCP_TIMEOUT = int(root.find('ClientTcpTimeout').text)
+        self.CLIENT_SEND_BUFFER_LIMIT = int(root.find('ClientSendBufferLimit').text)
         self.SAVING_NETWORK_DIRECTORY = root.find('SavingNetworkDirectory').text
         self.SAVING_INTERVAL = int(root.find('SavingInterval').text)
         self.SERVER_POLLING_INTERVAL = int(root.find('ServerPollingInterval').text)
+        self.SERVER_POLLING_MAX_INTERVAL = int(root.find('ServerPollingMaxInterval').text)
 
         ssh_connection_element = root.find('SSHConnection')
         self.SSH_PORT = int(ssh_connection_element.find("Port").text)
         self.SSH_USERNAME = ssh_connection_element.find("Username").text
         self.SSH_PASSWORD = ssh_connection_element.find("Password").text
+        self.SSH_MAX_WORKERS = int(ssh_connection_element.find("MaxWorkers").text)
+        self.SSH_TIMEOUT = int(ssh_connection_element.find("Timeout").text)
+        self.SSH_POOL_SIZE = int(ssh_connection_element.find("PoolSize").text)
+        self.SSH_IDLE_TIMEOUT = int(ssh_connection_element.find("IdleTimeout").text)
+        self.SSH_KEEPALIVE_INTERVAL = int(ssh_connection_element.find("KeepaliveInterval").text)
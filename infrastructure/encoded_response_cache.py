@@ -0,0 +1,58 @@
+import threading
+
+from infrastructure.framed_socket import encode_frames
+from infrastructure.messages.generalMessage import GeneralMessage
+from infrastructure.messages.stateDeltaMessage import StateDeltaMessage
+from infrastructure.state_tracker import NO_REVISION
+
+
+class EncodedResponseCache:
+    """
+    Frames of the state responses (StateUpdate, StateDelta) already encoded for a connection.
+
+    Every slave at the same revision gets the same response: the master encodes it once per codec, and sends the
+    same buffer to all of them. Entries are keyed by the base revision of the response (none for a full state), its
+    revision and the encoding of the connection. The cache is cleared whenever the shared state changes.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._frames: dict[tuple, bytes] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so a response built before it is not stored after it
+        self._generation: int = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._frames.clear()
+            self._generation += 1
+
+    def send(self, connection, message: GeneralMessage):
+        """
+        Send a state response on a FramedSocket or an AsyncFramedConnection, encoding it only on a cache miss.
+        """
+        connection.send_encoded(self.encode(connection, message))
+
+    def encode(self, connection, message: GeneralMessage) -> memoryview:
+        """
+        :return: the frames of the state response for the encoding of the connection, shared with the other ones
+        """
+        codec = connection.codec
+        base_revision = message.delta.base_revision if isinstance(message, StateDeltaMessage) else NO_REVISION
+        key = (message.MESSAGE_TYPE, base_revision, message.revision, codec.codec_id, connection.chunk_size,
+               connection.compress_min_size)
+
+        with self._lock:
+            frames = self._frames.get(key)
+            generation = self._generation
+
+        if frames is None:
+            frames = encode_frames(codec.encode(message.to_dict()), codec.codec_id, connection.chunk_size,
+                                   connection.compress_min_size)
+            with self._lock:
+                if generation == self._generation:
+                    if len(self._frames) >= self.max_entries:
+                        del self._frames[next(iter(self._frames))]  # Oldest entry
+                    self._frames[key] = frames
+
+        return memoryview(frames)
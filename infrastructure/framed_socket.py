@@ -0,0 +1,214 @@
+import select
+import socket
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+
+from infrastructure.message_codec import JSON_CODEC, MessageCodec, get_codec_by_id
+from infrastructure.messages.generalMessage import GeneralMessage
+
+# Every frame starts with the size of its payload, as a 4 bytes unsigned int in network byte order, followed by the
+# id of the codec used to encode the payload
+FRAME_HEADER = struct.Struct("!IB")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Flags carried by the high bits of the codec id. A large message may be split into several frames, all flagged as
+# continued except the last one, and its payload may be compressed as a whole before being split
+COMPRESSED_FLAG = 0x80
+CONTINUED_FLAG = 0x40
+CODEC_ID_MASK = 0x3F
+MAX_MESSAGE_SIZE = 512 * 1024 * 1024  # Once reassembled and decompressed
+
+
+class FramingError(Exception):
+    """Raised when the byte stream does not follow the framing protocol."""
+
+
+def encode_frame(payload: bytes, codec_id: int = JSON_CODEC.codec_id) -> bytes:
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FramingError(f"Frame of {len(payload)} bytes exceeds the maximum size of {MAX_FRAME_SIZE} bytes")
+    return FRAME_HEADER.pack(len(payload), codec_id) + payload
+
+
+def encode_frames(payload: bytes, codec_id: int = JSON_CODEC.codec_id, chunk_size: int = 0,
+                  compress_min_size: int = 0) -> bytes:
+    """
+    Encode a message as a single frame, or as several frames when its payload is larger than chunk_size.
+    :param chunk_size: maximal size of the payload of a frame, 0 to never split a message
+    :param compress_min_size: payloads of at least this size are compressed with zlib, 0 to never compress
+    """
+    if compress_min_size and len(payload) >= compress_min_size:
+        compressed = zlib.compress(payload)
+        if len(compressed) < len(payload):
+            payload = compressed
+            codec_id |= COMPRESSED_FLAG
+
+    if not chunk_size or len(payload) <= chunk_size:
+        return encode_frame(payload, codec_id)
+
+    view = memoryview(payload)
+    chunks = []
+    for offset in range(0, len(view), chunk_size):
+        chunk = view[offset:offset + chunk_size]
+        last = offset + chunk_size >= len(view)
+        chunks.append(FRAME_HEADER.pack(len(chunk), codec_id if last else codec_id | CONTINUED_FLAG))
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def decode_frame(codec_id: int, payload: bytes) -> tuple[MessageCodec, dict]:
+    try:
+        codec = get_codec_by_id(codec_id)
+    except ValueError as e:
+        raise FramingError(str(e))
+    return codec, codec.decode(payload)
+
+
+class FrameReader:
+    """
+    Collects the chunks read from a stream and splits them into whole frames.
+    A single chunk may contain a part of a frame, or several frames sent one after the other.
+    Messages split into several frames are reassembled, and decompressed, before being returned.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._message: bytearray | None = None  # Payload of the frames of a message received so far
+
+    def feed(self, data: bytes) -> list[tuple[int, bytes]]:
+        """
+        :return: the codec id and the payload of every message completed by the given data
+        """
+        self._buffer.extend(data)
+        frames = []
+
+        while len(self._buffer) >= FRAME_HEADER.size:
+            size, codec_id = FRAME_HEADER.unpack_from(self._buffer)
+            if size > MAX_FRAME_SIZE:
+                raise FramingError(f"Announced frame of {size} bytes exceeds the maximum size of {MAX_FRAME_SIZE} bytes")
+
+            end = FRAME_HEADER.size + size
+            if len(self._buffer) < end:
+                break  # Wait for the rest of the frame
+
+            payload = bytes(self._buffer[FRAME_HEADER.size:end])
+            del self._buffer[:end]
+
+            if codec_id & CONTINUED_FLAG or self._message is not None:
+                if self._message is None:
+                    self._message = bytearray()
+                self._message.extend(payload)
+                if len(self._message) > MAX_MESSAGE_SIZE:
+                    raise FramingError(f"Message exceeds the maximum size of {MAX_MESSAGE_SIZE} bytes")
+                if codec_id & CONTINUED_FLAG:
+                    continue  # Wait for the next frames of the message
+
+                payload, self._message = bytes(self._message), None
+
+            if codec_id & COMPRESSED_FLAG:
+                payload = self._decompress(payload)
+            frames.append((codec_id & CODEC_ID_MASK, payload))
+
+        return frames
+
+    @staticmethod
+    def _decompress(payload: bytes) -> bytes:
+        decompressor = zlib.decompressobj()
+        try:
+            data = decompressor.decompress(payload, MAX_MESSAGE_SIZE)
+        except zlib.error as e:
+            raise FramingError(f"Corrupted compressed message: {e}")
+        if decompressor.unconsumed_tail:
+            raise FramingError(f"Message exceeds the maximum size of {MAX_MESSAGE_SIZE} bytes")
+        return data
+
+
+class FramedSocket:
+    """
+    Wrap a connected TCP socket to send and receive whole messages.
+    Sending is thread-safe, receiving must be done from a single thread.
+
+    Messages are sent with the codec of the socket. Received frames are decoded with the codec announced in their
+    header, which then becomes the codec of the socket, so a master always answers a slave in its own codec.
+    Large messages (full state snapshots) are compressed and split into frames of chunk_size, see encode_frames().
+    """
+
+    def __init__(self, sock, codec: MessageCodec = JSON_CODEC, recv_size: int = 65536, chunk_size: int = 0,
+                 compress_min_size: int = 0):
+        self.sock = sock
+        self.codec = codec
+        self.recv_size = recv_size
+        self.chunk_size = chunk_size
+        self.compress_min_size = compress_min_size
+        self._reader = FrameReader()
+        self._pending_frames: deque[tuple[int, bytes]] = deque()
+        self._send_lock = threading.Lock()
+
+    def send_message(self, message: GeneralMessage):
+        codec = self.codec
+        self.send_frame(codec.encode(message.to_dict()), codec.codec_id)
+
+    def send_messages(self, messages: list[GeneralMessage]):
+        # Pipeline several messages in a single write
+        codec = self.codec
+        data = b"".join(encode_frames(codec.encode(message.to_dict()), codec.codec_id, self.chunk_size,
+                                      self.compress_min_size) for message in messages)
+        with self._send_lock:
+            self.sock.sendall(data)
+
+    def send_frame(self, payload: bytes, codec_id: int = JSON_CODEC.codec_id):
+        self.send_encoded(encode_frames(payload, codec_id, self.chunk_size, self.compress_min_size))
+
+    def send_encoded(self, frames: bytes | memoryview, timeout: float | None = None):
+        """
+        Send frames already encoded, shared buffers are sent without being copied.
+        :param timeout: time given to the peer to take all the frames, in seconds. The timeout of the socket when None
+        :raise socket.timeout: if the frames have not all been sent in time, the stream is then corrupted
+        """
+        with self._send_lock:
+            if timeout is None:
+                self.sock.sendall(frames)
+                return
+
+            view = memoryview(frames).cast("B")
+            deadline = time.monotonic() + timeout
+            while view:
+                # The timeout of the socket is shared with the receiving thread, it is left untouched
+                _, writable, _ = select.select([], [self.sock], [], max(0.0, deadline - time.monotonic()))
+                if not writable:
+                    raise socket.timeout(f"Peer did not take the frames within {timeout} s")
+                view = view[self.sock.send(view):]
+
+    def receive_frame(self) -> tuple[int, bytes] | None:
+        """
+        Block until a whole message is available.
+        :return: the codec id and the payload of the message, or None if the peer closed the connection
+        """
+        while not self._pending_frames:
+            data = self.sock.recv(self.recv_size)
+            if not data:
+                return None
+            self._pending_frames.extend(self._reader.feed(data))
+
+        return self._pending_frames.popleft()
+
+    def receive(self) -> dict | None:
+        frame = self.receive_frame()
+        if frame is None:
+            return None
+
+        self.codec, msg = decode_frame(*frame)
+        return msg
+
+    def settimeout(self, timeout: float | None):
+        self.sock.settimeout(timeout)
+
+    def close(self):
+        try:
+            # Wakes up the thread blocked in receive, if the socket is closed by another one
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Not connected anymore
+        self.sock.close()
@@ -1,26 +1,163 @@
 import logging
 import socket
+import struct
+import threading
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, the interfaces are read with ioctl or the hostname otherwise
+    psutil = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+LOOPBACK_IP = "127.0.0.1"
+BROADCAST_ADDRESS = "<broadcast>"
+SIOCGIFADDR = 0x8915
+
 
 class IpManager:
+    """
+    Addresses of the local interfaces, read from the interface table and kept in a cache.
+
+    Checking whether an address is one of ours is a set lookup, done for every received datagram: it never touches
+    the resolver nor the network. The cache is refreshed by a background thread, so a new or lost interface is seen
+    after at most one refresh interval.
+
+    The own address is the one of the interface routing towards the LAN address (the broadcast by default), which
+    the other users can reach. Connecting a UDP socket only looks up the route, nothing is sent.
+    """
 
     logger = logging.getLogger("IpManager")
 
+    _own_ips: frozenset[str] = frozenset()
+    _own_ip: str = LOOPBACK_IP
+    _lan_address: str = BROADCAST_ADDRESS
+    _loaded: bool = False
+    _refresh_lock = threading.Lock()
+    _refresh_thread: threading.Thread | None = None
+
+    @classmethod
+    def configure(cls, lan_address: str = ""):
+        """
+        :param lan_address: an address of the LAN of the users, the own address is the one routing towards it
+        """
+        cls._lan_address = lan_address or BROADCAST_ADDRESS
+        cls.refresh()
+
+    @classmethod
+    def get_own_ip(cls) -> str:
+        """
+        :return: the main address of the user, the loopback if no interface is up
+        """
+        cls._ensure_loaded()
+        return cls._own_ip
+
+    @classmethod
+    def get_own_ips(cls) -> frozenset[str]:
+        cls._ensure_loaded()
+        return cls._own_ips
+
+    @classmethod
+    def is_own_ip(cls, ip: str) -> bool:
+        cls._ensure_loaded()
+        return ip in cls._own_ips
+
+    @classmethod
+    def _ensure_loaded(cls):
+        if not cls._loaded:
+            cls.refresh()
+
+    @classmethod
+    def refresh(cls) -> bool:
+        """
+        Read the interface table again.
+        :return: True if the addresses changed
+        """
+        with cls._refresh_lock:
+            addresses = cls._read_interfaces()
+            own_ips = frozenset(addresses) | {LOOPBACK_IP}
+            own_ip = cls._routed_address(cls._lan_address)
+            if own_ip not in own_ips:
+                # No route towards the LAN, the first address which may be reached by the other users
+                own_ip = next((ip for ip in addresses if not ip.startswith(("127.", "169.254."))), LOOPBACK_IP)
+
+            changed = cls._loaded and (own_ips != cls._own_ips or own_ip != cls._own_ip)
+            # A single assignment each, the readers never see a partial set
+            cls._own_ips = own_ips
+            cls._own_ip = own_ip
+            cls._loaded = True
+
+        if changed:
+            cls.logger.info(f"Network interfaces changed, own address is {own_ip}, all addresses: {sorted(own_ips)}")
+        return changed
+
+    @classmethod
+    def start_refresh(cls, interval: float, stop_event: threading.Event):
+        """Refresh the addresses every interval seconds, until the event is set."""
+        if cls._refresh_thread is not None and cls._refresh_thread.is_alive():
+            return
+
+        cls._refresh_thread = threading.Thread(target=cls._refresh_loop, args=(interval, stop_event), daemon=True)
+        cls._refresh_thread.start()
+
+    @classmethod
+    def _refresh_loop(cls, interval: float, stop_event: threading.Event):
+        cls.logger.info(f"Thread <IP_REFRESH> started!")
+        while not stop_event.wait(interval):
+            try:
+                cls.refresh()
+            except Exception as e:
+                cls.logger.error(f"Failed to read the network interfaces: {e}")
+        cls.logger.info(f"Thread <IP_REFRESH> is shutting down")
+
     @staticmethod
-    def get_own_ip() -> str:
-        # determine local IP
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    def _routed_address(target: str) -> str | None:
+        """
+        :return: the address of the interface routing towards the target, None if there is no route
+        """
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock.connect((target, 9))
+                return sock.getsockname()[0]
+        except OSError:
+            return None
+
+    @classmethod
+    def _read_interfaces(cls) -> list[str]:
+        """
+        :return: the IPv4 addresses of the interfaces which are up, in the order of the interface table
+        """
+        if psutil is not None:
+            stats = psutil.net_if_stats()
+            return [address.address
+                    for name, addresses in psutil.net_if_addrs().items()
+                    if name not in stats or stats[name].isup
+                    for address in addresses if address.family == socket.AF_INET]
+
+        if fcntl is not None:
+            addresses = cls._read_interfaces_ioctl()
+            if addresses:
+                return addresses
+
+        # Last resort, only reached from a refresh: the hostname usually resolves locally
         try:
-            s.connect(('8.8.8.8', 80))
-            ip = s.getsockname()[0]
-            return ip
-        except:
-            logger.error(f"Failed to identify user")
-            return '127.0.0.1'
-        finally:
-            s.close()
+            return socket.gethostbyname_ex(socket.gethostname())[2]
+        except OSError as e:
+            cls.logger.error(f"Failed to identify user: {e}")
+            return []
 
     @staticmethod
-    def get_own_ips() -> set[str]:
-        hostname = socket.gethostname()
-        _, _, host_ips = socket.gethostbyname_ex(hostname)
-        return set(host_ips)
\ No newline at end of file
+    def _read_interfaces_ioctl() -> list[str]:
+        addresses = []
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for _, name in socket.if_nameindex():
+                try:
+                    request = struct.pack("256s", name[:15].encode())
+                    addresses.append(socket.inet_ntoa(fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)[20:24]))
+                except OSError:
+                    continue  # No IPv4 address on this interface
+        return addresses
@@ -0,0 +1,225 @@
+import json
+import struct
+from array import array
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, the other codecs are always available
+    msgpack = None
+
+
+class MessageCodec:
+    """Turn a message (as a dict with its Type and Payload) into bytes for the TCP channel, and back."""
+
+    name: str = ""
+    codec_id: int = 0
+
+    def encode(self, msg: dict) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> dict:
+        raise NotImplementedError
+
+
+class JsonCodec(MessageCodec):
+    name = "json"
+    codec_id = 0
+
+    def encode(self, msg: dict) -> bytes:
+        return json.dumps(msg).encode()
+
+    def decode(self, data: bytes) -> dict:
+        return json.loads(data.decode())
+
+
+class MsgpackCodec(MessageCodec):
+    name = "msgpack"
+    codec_id = 1
+
+    def encode(self, msg: dict) -> bytes:
+        return msgpack.packb(msg)
+
+    def decode(self, data: bytes) -> dict:
+        # Tuples are sent as lists, like with json
+        return msgpack.unpackb(data, strict_map_key=False)
+
+
+class StructCodec(MessageCodec):
+    """
+    Compact binary codec relying only on the standard library.
+
+    Lists of rows sharing the same keys (servers, nodes, requests...) are extracted from the message and stored
+    column by column: strings joined in a single utf-8 buffer, integers packed in an int64 array, and booleans in a
+    byte per row. The keys are sent once per list instead of once per row. The rest of the message is kept as JSON.
+
+    Layout: [size of the JSON part][JSON part][tables], where every table is
+            [size of the JSON header][JSON header: keys and column types][size of each column][columns]
+    """
+
+    name = "struct"
+    codec_id = 2
+
+    _SIZE = struct.Struct("!I")
+    _TABLE_MARKER = "$table"
+    _STRING_SEPARATOR = "\x00"
+    _MIN_TABLE_ROWS = 2
+
+    # Column types
+    _STRINGS = "s"
+    _INTEGERS = "q"
+    _BOOLEANS = "b"
+    _JSON = "j"
+
+    _BOOLEAN_CODES = {False: 0, True: 1, None: 2}
+    _BOOLEAN_VALUES = (False, True, None)
+
+    def encode(self, msg: dict) -> bytes:
+        tables: list[list[dict]] = []
+        skeleton = self._extract_tables(msg, tables)
+
+        chunks = [json.dumps(skeleton).encode()]
+        chunks.extend(self._encode_table(rows) for rows in tables)
+        return b"".join(self._SIZE.pack(len(chunk)) + chunk for chunk in chunks)
+
+    def decode(self, data: bytes) -> dict:
+        view = memoryview(data)
+        chunks = []
+        offset = 0
+        while offset < len(view):
+            (size,) = self._SIZE.unpack_from(view, offset)
+            offset += self._SIZE.size
+            chunks.append(view[offset:offset + size])
+            offset += size
+
+        tables = [self._decode_table(chunk) for chunk in chunks[1:]]
+        return self._restore_tables(json.loads(bytes(chunks[0]).decode()), tables)
+
+    def _extract_tables(self, value, tables: list):
+        if isinstance(value, dict):
+            return {key: self._extract_tables(item, tables) for key, item in value.items()}
+
+        if isinstance(value, (list, tuple)):
+            if self._is_table(value):
+                tables.append(value)
+                return {self._TABLE_MARKER: len(tables) - 1}
+            return [self._extract_tables(item, tables) for item in value]
+
+        return value
+
+    def _is_table(self, rows) -> bool:
+        # Rows are counted by their columns once decoded, a table needs at least one
+        if len(rows) < self._MIN_TABLE_ROWS or not isinstance(rows[0], dict) or not rows[0]:
+            return False
+
+        keys = rows[0].keys()
+        return all(isinstance(row, dict) and row.keys() == keys for row in rows)
+
+    def _restore_tables(self, value, tables: list):
+        if isinstance(value, dict):
+            if value.keys() == {self._TABLE_MARKER}:
+                return tables[value[self._TABLE_MARKER]]
+            return {key: self._restore_tables(item, tables) for key, item in value.items()}
+
+        if isinstance(value, list):
+            return [self._restore_tables(item, tables) for item in value]
+
+        return value
+
+    def _encode_table(self, rows: list[dict]) -> bytes:
+        keys = list(rows[0].keys())
+        types = []
+        columns = []
+
+        for key in keys:
+            column_type, column = self._encode_column([row[key] for row in rows])
+            types.append(column_type)
+            columns.append(column)
+
+        header = json.dumps({"keys": keys, "types": types, "rows": len(rows)}).encode()
+        return b"".join(self._SIZE.pack(len(chunk)) + chunk for chunk in [header] + columns)
+
+    def _encode_column(self, values: list) -> tuple[str, bytes]:
+        kinds = set(map(type, values))
+
+        if kinds == {str}:
+            text = self._STRING_SEPARATOR.join(values)
+            if text.count(self._STRING_SEPARATOR) == len(values) - 1:  # No separator inside the values
+                return self._STRINGS, text.encode()
+
+        elif kinds == {int} and all(-2 ** 63 <= value < 2 ** 63 for value in values):
+            return self._INTEGERS, array("q", values).tobytes()
+
+        elif kinds <= {bool, type(None)}:
+            return self._BOOLEANS, bytes(self._BOOLEAN_CODES[value] for value in values)
+
+        return self._JSON, json.dumps(values).encode()
+
+    def _decode_table(self, data: memoryview) -> list[dict]:
+        chunks = []
+        offset = 0
+        while offset < len(data):
+            (size,) = self._SIZE.unpack_from(data, offset)
+            offset += self._SIZE.size
+            chunks.append(data[offset:offset + size])
+            offset += size
+
+        header = json.loads(bytes(chunks[0]).decode())
+        columns = [self._decode_column(column_type, chunk, header["rows"])
+                   for column_type, chunk in zip(header["types"], chunks[1:])]
+
+        keys = header["keys"]
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+
+    def _decode_column(self, column_type: str, data: memoryview, rows: int) -> list:
+        if column_type == self._STRINGS:
+            return bytes(data).decode().split(self._STRING_SEPARATOR) if rows else []
+
+        if column_type == self._INTEGERS:
+            values = array("q")
+            values.frombytes(data)
+            return values.tolist()
+
+        if column_type == self._BOOLEANS:
+            return [self._BOOLEAN_VALUES[code] for code in bytes(data)]
+
+        return json.loads(bytes(data).decode())
+
+
+JSON_CODEC = JsonCodec()
+
+_CODECS: list[MessageCodec] = [JSON_CODEC, StructCodec()]
+if msgpack is not None:
+    _CODECS.append(MsgpackCodec())
+
+_CODECS_BY_ID: dict[int, MessageCodec] = {codec.codec_id: codec for codec in _CODECS}
+_CODECS_BY_NAME: dict[str, MessageCodec] = {codec.name: codec for codec in _CODECS}
+
+
+def available_codecs() -> list[str]:
+    return [codec.name for codec in _CODECS]
+
+
+def get_codec(name: str) -> MessageCodec:
+    """
+    :return: the codec with the given name, or the JSON codec if it is unknown or not installed
+    """
+    return _CODECS_BY_NAME.get(name, JSON_CODEC)
+
+
+def get_codec_by_id(codec_id: int) -> MessageCodec:
+    codec = _CODECS_BY_ID.get(codec_id)
+    if codec is None:
+        raise ValueError(f"Unknown codec id {codec_id}")
+    return codec
+
+
+def negotiate_codec(preferred: list[str], offered: list[str]) -> str:
+    """
+    :param preferred: codecs accepted by the master, by order of preference
+    :param offered: codecs supported by the slave
+    :return: the first preferred codec supported by both sides, JSON otherwise
+    """
+    for name in preferred:
+        if name in offered and name in _CODECS_BY_NAME:
+            return name
+    return JSON_CODEC.name
@@ -1,52 +1,37 @@
 import logging
 
-from infrastructure.messages.fetchStateMessage import FetchStateMessage
-from infrastructure.messages.forceMasterMessage import ForceMasterMessage
-from infrastructure.messages.heartbeatMessage import HeartBeatMessage
-from infrastructure.messages.joinRequestMessage import JoinRequestMessage
-from infrastructure.messages.joinResponseMessage import JoinResponseMessage
-from infrastructure.messages.leaveNotificationMessage import LeaveNotificationMessage
-from infrastructure.messages.stateUpdateMessage import StateUpdateMessage
-from models.clusterView import ClusterView
-from models.serversData import ServersData
-from models.usersRequests import UsersRequests
+# Imported for their registration in the registry of GeneralMessage
+from infrastructure.messages import (actionRequestMessage, fetchStateMessage, forceMasterMessage, heartbeatMessage,
+                                     joinRequestMessage, joinResponseMessage, leaveNotificationMessage,
+                                     stateDeltaMessage, stateNotModifiedMessage, stateUpdateMessage,
+                                     subscribeStateMessage)
+from infrastructure.messages.generalMessage import GeneralMessage
 
 
 class MessageDeserializer:
+    """
+    Build the messages received on the wire, with the decoder registered by their class for their type tag.
+    An instance is meant to live as long as the connection (or the listener) it decodes the messages of.
+    """
 
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._decoders = {msg_type: message_class.from_payload
+                          for msg_type, message_class in GeneralMessage.registered_types().items()}
 
-    def deserialize(self, msg):
+    def deserialize(self, msg) -> GeneralMessage | None:
         msg_type = msg.get('Type', None)
 
         if msg_type is None:
             self.logger.error(f"Message not identified as a valid message")
             return
 
-        payload: dict = msg.get("Payload")
+        decoder = self._decoders.get(msg_type)
+        if decoder is None:
+            self.logger.error(f"Message type identified does not corresponds to any known type")
+            return
 
         try:
-            if msg_type == "FetchState":
-                return FetchStateMessage()
-            elif msg_type == "ForceMaster":
-                return ForceMasterMessage(payload["requestedBy"])
-            elif msg_type == "Heartbeat":
-                return HeartBeatMessage()
-            elif msg_type == "JoinRequest":
-                return JoinRequestMessage(payload["nodeIP"])
-            elif msg_type == "JoinResponse":
-                return JoinResponseMessage(ServersData().from_json(payload["serversData"]),
-                                           ClusterView().from_json(payload["clusterView"]),
-                                           UsersRequests().from_json(payload["userRequests"]))
-            elif msg_type == "LeaveNotification":
-                return LeaveNotificationMessage(payload["nodeIP"])
-            elif msg_type == "StateUpdate":
-                return StateUpdateMessage(ServersData().from_json(payload["serversData"]),
-                                          ClusterView().from_json(payload["clusterView"]),
-                                          UsersRequests().from_json(payload["userRequests"]))
-            else:
-                self.logger.error(f"Message type identified does not corresponds to any known type")
+            return decoder(msg.get("Payload"))
         except Exception as e:
             self.logger.error(f"Message type identified, but deserialization failed: {e}")
-
@@ -3,6 +3,7 @@ from models.userRequest import UserRequest
 
 
 class ActionRequestMessage(GeneralMessage):
+    MESSAGE_TYPE = "ActionRequest"
 
     def __init__(self, user_request: UserRequest):
         self.user_request = user_request
@@ -10,5 +11,9 @@ class ActionRequestMessage(GeneralMessage):
     def get_payload(self):
         return {"userRequest": self.user_request.to_dict()}
 
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(UserRequest().from_json(payload["userRequest"]))
+
     def to_json(self):
-        return self._to_json("ActionRequest")
+        return self._to_json(self.MESSAGE_TYPE)
@@ -2,9 +2,19 @@ from infrastructure.messages.generalMessage import GeneralMessage
 
 
 class FetchStateMessage(GeneralMessage):
+    MESSAGE_TYPE = "FetchState"
+
+    def __init__(self, revision: int = -1):
+        # Last revision of the state held by the slave, -1 if it holds none
+        self.revision = revision
 
     def get_payload(self):
-        return None
+        return {"revision": self.revision}
+
+    @classmethod
+    def from_payload(cls, payload):
+        # Older slaves send a FetchState without payload
+        return cls((payload or {}).get("revision", -1))
 
     def to_json(self):
-        return self._to_json("FetchState")
+        return self._to_json(self.MESSAGE_TYPE)
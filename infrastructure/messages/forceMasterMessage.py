@@ -4,6 +4,7 @@ from infrastructure.messages.generalMessage import GeneralMessage
 
 
 class ForceMasterMessage(GeneralMessage):
+    MESSAGE_TYPE = "ForceMaster"
 
     def __init__(self, ip):
         self.ip = ip
@@ -11,5 +12,9 @@ class ForceMasterMessage(GeneralMessage):
     def get_payload(self):
         return {"requestedBy": self.ip}
 
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["requestedBy"])
+
     def to_json(self):
-        return self._to_json("ForceMaster")
\ No newline at end of file
+        return self._to_json(self.MESSAGE_TYPE)
\ No newline at end of file
@@ -3,6 +3,26 @@ from abc import abstractmethod
 
 
 class GeneralMessage:
+    # Type tag of the message on the wire, defined by every subclass
+    MESSAGE_TYPE: str = ""
+
+    # Message class of every type tag, filled when the subclasses are defined
+    _registry: dict[str, type["GeneralMessage"]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.MESSAGE_TYPE:
+            GeneralMessage._registry[cls.MESSAGE_TYPE] = cls
+
+    @staticmethod
+    def registered_types() -> dict[str, type["GeneralMessage"]]:
+        return dict(GeneralMessage._registry)
+
+    @classmethod
+    @abstractmethod
+    def from_payload(cls, payload):
+        """Build the message from the payload received on the wire."""
+        pass
 
     def get_type(self):
         return self.__class__
@@ -18,5 +38,8 @@ class GeneralMessage:
     def _to_json(self, msg_type):
         return json.dumps({"Type": msg_type, "Payload": self.get_payload()})
 
+    def to_dict(self):
+        return {"Type": self.MESSAGE_TYPE, "Payload": self.get_payload()}
+
     def get_name(self):
         return self.__class__.__name__
\ No newline at end of file
@@ -2,9 +2,27 @@ from infrastructure.messages.generalMessage import GeneralMessage
 
 
 class HeartBeatMessage(GeneralMessage):
+    """
+    Broadcast by the master to tell it is alive, and which state it holds: the slaves fetch the state only when it
+    differs from theirs.
+    """
+    MESSAGE_TYPE = "Heartbeat"
+
+    def __init__(self, revision: int = -1, digest: str = "", epoch: str = ""):
+        # Current revision of the state of the master, -1 if it does not announce it
+        self.revision: int = revision
+        self.digest: str = digest
+        # Changes every time a node becomes the master, the revisions of two epochs are not comparable
+        self.epoch: str = epoch
 
     def get_payload(self):
-        return None
+        return {"revision": self.revision, "digest": self.digest, "epoch": self.epoch}
+
+    @classmethod
+    def from_payload(cls, payload):
+        # Older masters send a Heartbeat without payload
+        payload = payload or {}
+        return cls(payload.get("revision", -1), payload.get("digest", ""), payload.get("epoch", ""))
 
     def to_json(self):
-        return self._to_json("Heartbeat")
\ No newline at end of file
+        return self._to_json(self.MESSAGE_TYPE)
@@ -2,12 +2,19 @@ from infrastructure.messages.generalMessage import GeneralMessage
 
 
 class JoinRequestMessage(GeneralMessage):
+    MESSAGE_TYPE = "JoinRequest"
 
-    def __init__(self, ip):
+    def __init__(self, ip, codecs=None):
         self.ip = ip
+        # Wire codecs supported by the node
+        self.codecs: list[str] = codecs or ["json"]
 
     def get_payload(self):
-        return {"nodeIP": self.ip}
+        return {"nodeIP": self.ip, "codecs": self.codecs}
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["nodeIP"], payload.get("codecs"))
 
     def to_json(self):
-        return self._to_json("JoinRequest")
+        return self._to_json(self.MESSAGE_TYPE)
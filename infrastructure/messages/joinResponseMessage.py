@@ -1,21 +1,28 @@
 from infrastructure.messages.generalMessage import GeneralMessage
-from models.clusterView import ClusterView
-from models.serversData import ServersData
-from models.usersRequests import UsersRequests
 
 
 class JoinResponseMessage(GeneralMessage):
+    """
+    Answer of the master to a JoinRequest. It only tells where the master is: the state itself is fetched over the
+    TCP channel, since it would not fit in a datagram.
+    """
+    MESSAGE_TYPE = "JoinResponse"
 
-    def __init__(self, servers_data, cluster_view, user_requests):
-        self.servers_data: ServersData = servers_data
-        self.cluster_view: ClusterView = cluster_view
-        self.user_requests: UsersRequests = user_requests
+    def __init__(self, master_ip, revision=-1, codec="json"):
+        self.master_ip: str = master_ip
+        # Revision of the state of the master when it answered
+        self.revision: int = revision
+        # Wire codec chosen by the master for the TCP channel
+        self.codec: str = codec
 
     def get_payload(self):
-        return {"serversData": self.servers_data.to_dict(),
-                "clusterView": self.cluster_view.to_dict(),
-                "userRequests": self.user_requests.to_dict()}
+        return {"masterIP": self.master_ip,
+                "revision": self.revision,
+                "codec": self.codec}
 
-    def to_json(self):
-        return self._to_json("JoinResponse")
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["masterIP"], payload.get("revision", -1), payload.get("codec", "json"))
 
+    def to_json(self):
+        return self._to_json(self.MESSAGE_TYPE)
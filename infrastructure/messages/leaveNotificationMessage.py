@@ -2,6 +2,7 @@ from infrastructure.messages.generalMessage import GeneralMessage
 
 
 class LeaveNotificationMessage(GeneralMessage):
+    MESSAGE_TYPE = "LeaveNotification"
 
     def __init__(self, ip):
         self.ip = ip
@@ -9,6 +10,10 @@ class LeaveNotificationMessage(GeneralMessage):
     def get_payload(self):
         return {"nodeIP": self.ip}
 
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["nodeIP"])
+
     def to_json(self):
-        return self._to_json("LeaveNotification")
+        return self._to_json(self.MESSAGE_TYPE)
 
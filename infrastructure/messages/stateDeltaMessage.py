@@ -0,0 +1,23 @@
+from infrastructure.messages.generalMessage import GeneralMessage
+from models.stateDelta import StateDelta
+
+
+class StateDeltaMessage(GeneralMessage):
+    MESSAGE_TYPE = "StateDelta"
+
+    def __init__(self, delta: StateDelta):
+        self.delta: StateDelta = delta
+
+    @property
+    def revision(self):
+        return self.delta.revision
+
+    def get_payload(self):
+        return self.delta.to_dict()
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(StateDelta.from_json(payload))
+
+    def to_json(self):
+        return self._to_json(self.MESSAGE_TYPE)
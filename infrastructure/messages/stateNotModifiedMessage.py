@@ -0,0 +1,18 @@
+from infrastructure.messages.generalMessage import GeneralMessage
+
+
+class StateNotModifiedMessage(GeneralMessage):
+    MESSAGE_TYPE = "StateNotModified"
+
+    def __init__(self, revision: int):
+        self.revision = revision
+
+    def get_payload(self):
+        return {"revision": self.revision}
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["revision"])
+
+    def to_json(self):
+        return self._to_json(self.MESSAGE_TYPE)
@@ -5,16 +5,26 @@ from models.usersRequests import UsersRequests
 
 
 class StateUpdateMessage(GeneralMessage):
+    MESSAGE_TYPE = "StateUpdate"
 
-    def __init__(self, servers_data, cluster_view, user_requests):
+    def __init__(self, servers_data, cluster_view, user_requests, revision=-1):
         self.servers_data: ServersData = servers_data
         self.cluster_view: ClusterView = cluster_view
         self.user_requests: UsersRequests = user_requests
+        self.revision: int = revision
 
     def get_payload(self):
         return {"serversData": self.servers_data.to_dict(),
                 "clusterView": self.cluster_view.to_dict(),
-                "userRequests": self.user_requests.to_dict()}
+                "userRequests": self.user_requests.to_dict(),
+                "revision": self.revision}
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(ServersData.from_json(payload["serversData"]),
+                   ClusterView().from_json(payload["clusterView"]),
+                   UsersRequests().from_json(payload["userRequests"]),
+                   payload.get("revision", -1))
 
     def to_json(self):
-        return self._to_json("StateUpdate")
+        return self._to_json(self.MESSAGE_TYPE)
@@ -0,0 +1,19 @@
+from infrastructure.messages.generalMessage import GeneralMessage
+
+
+class SubscribeStateMessage(GeneralMessage):
+    MESSAGE_TYPE = "SubscribeState"
+
+    def __init__(self, revision: int = -1):
+        # Last revision of the state held by the slave, -1 if it holds none
+        self.revision = revision
+
+    def get_payload(self):
+        return {"revision": self.revision}
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["revision"])
+
+    def to_json(self):
+        return self._to_json(self.MESSAGE_TYPE)
@@ -0,0 +1,137 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+# Priorities of the scheduled polls, the lowest goes first when several hosts are due
+MANUAL_REFRESH = 0
+SCHEDULED = 1
+
+
+class PollingScheduler:
+    """
+    Keep the next due time of every host in a priority queue.
+
+    A host that did not change since its last poll is polled less and less often, up to max_interval. A host that
+    just changed or failed goes back to min_interval, and a manual refresh makes it due right away, ahead of the
+    scheduled hosts. New hosts and rescheduled ones are spread over time, so the SSH load is even instead of bursting
+    every host at once.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, backoff_factor: float = 2.0, jitter: float = 0.1):
+        """
+        :param min_interval: interval between two polls of an active host, in seconds
+        :param max_interval: interval between two polls of a stable host, in seconds
+        :param backoff_factor: growth of the interval every time a poll finds no change
+        :param jitter: part of the interval randomly added or removed, to keep the hosts spread
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+
+        self._heap: list[tuple[float, int, int, str]] = []  # (due time, priority, order, host)
+        self._due: dict[str, tuple[float, int]] = {}  # Current schedule of every host, older heap entries are stale
+        self._intervals: dict[str, float] = {}
+        self._polling: set[str] = set()  # Hosts returned by pop_due and not reported yet
+        # Manual refreshes waiting for a poll to start, and for the poll in progress to be reported
+        self._refresh_waiters: dict[str, list[threading.Event]] = {}
+        self._polling_waiters: dict[str, list[threading.Event]] = {}
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def sync_hosts(self, hosts: list[str]):
+        """Schedule the new hosts, and forget the ones that are not in the list anymore."""
+        hosts = dict.fromkeys(hosts)
+        now = time.time()
+        with self._lock:
+            new_hosts = [host for host in hosts if host not in self._intervals]
+            for index, host in enumerate(new_hosts):
+                self._intervals[host] = self.min_interval
+                self._schedule(host, now + index * self.min_interval / len(new_hosts), SCHEDULED)
+
+            for host in [host for host in self._intervals if host not in hosts]:
+                del self._intervals[host]
+                self._due.pop(host, None)
+                self._polling.discard(host)
+                self._release(self._refresh_waiters.pop(host, []) + self._polling_waiters.pop(host, []))
+
+    def pop_due(self) -> list[str]:
+        """
+        :return: the hosts due for a poll, the manual refreshes first. They are not scheduled again until reported.
+        """
+        now = time.time()
+        due_hosts = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, priority, _, host = heapq.heappop(self._heap)
+                if self._due.get(host) != (due, priority):
+                    continue  # Stale entry, the host has been rescheduled or removed
+
+                del self._due[host]
+                self._polling.add(host)
+                self._polling_waiters[host] = self._refresh_waiters.pop(host, [])
+                due_hosts.append(host)
+
+        return due_hosts
+
+    def report(self, host: str, changed: bool, failed: bool):
+        """Schedule the next poll of a host according to the result of the last one."""
+        with self._lock:
+            self._polling.discard(host)
+            self._release(self._polling_waiters.pop(host, []))
+            if host not in self._intervals:
+                return
+
+            if changed or failed:
+                interval = self.min_interval
+            else:
+                interval = min(self._intervals[host] * self.backoff_factor, self.max_interval)
+            self._intervals[host] = interval
+
+            if host in self._refresh_waiters:
+                # Refreshed manually during the poll, which may have read the host before the request
+                self._schedule(host, time.time(), MANUAL_REFRESH)
+                self._wakeup.set()
+            elif host not in self._due:
+                spread = interval * random.uniform(-self.jitter, self.jitter)
+                self._schedule(host, time.time() + interval + spread, SCHEDULED)
+
+    def request_refresh(self, host: str) -> threading.Event | None:
+        """
+        Make the host due right away, ahead of the hosts scheduled normally.
+        :return: an event set once the host has been polled, None if the host is unknown
+        """
+        done = threading.Event()
+        with self._lock:
+            if host not in self._intervals:
+                return None
+
+            self._refresh_waiters.setdefault(host, []).append(done)
+            self._intervals[host] = self.min_interval
+            if host not in self._polling:  # Otherwise scheduled again when the poll in progress is reported
+                self._schedule(host, time.time(), MANUAL_REFRESH)
+
+        self._wakeup.set()
+        return done
+
+    @staticmethod
+    def _release(waiters: list[threading.Event]):
+        for event in waiters:
+            event.set()
+
+    def wait(self, max_wait: float):
+        """Wait until the next host is due, a refresh is requested, or max_wait seconds elapsed."""
+        with self._lock:
+            # The top of the heap may be stale, but never later than the next due host
+            delay = self._heap[0][0] - time.time() if self._heap else max_wait
+
+        if delay > 0:
+            self._wakeup.wait(min(delay, max_wait))
+        self._wakeup.clear()
+
+    def _schedule(self, host: str, due: float, priority: int):
+        self._due[host] = (due, priority)
+        heapq.heappush(self._heap, (due, priority, next(self._order), host))
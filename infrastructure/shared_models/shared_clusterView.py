@@ -1,20 +1,22 @@
-from PySide6.QtCore import QObject, Signal, Property
-
+from infrastructure.shared_models.shared_model import SharedModel
+from models.changeSet import ChangeSet
 from models.clusterView import ClusterView
 
 
-class SharedClusterView(QObject):
-    dataChanged = Signal()
+class SharedClusterView(SharedModel):
 
     def __init__(self, initial: ClusterView):
-        super().__init__()
-        self._data = initial
+        super().__init__(initial)
 
-    def _get_data(self):
+    @property
+    def typed_data(self) -> ClusterView:
         return self._data
 
-    def _set_data(self, new):
-        self._data = new
-        self.dataChanged.emit()
-
-    data: ClusterView = Property(object, _get_data, _set_data, notify=dataChanged)
+    @staticmethod
+    def _diff(old: ClusterView, new: ClusterView) -> ChangeSet:
+        old_roles = {node.nodeIP: node.role for node in old.nodes}
+        new_roles = {node.nodeIP: node.role for node in new.nodes}
+        return ChangeSet(joined_nodes=[ip for ip in new_roles if ip not in old_roles],
+                         left_nodes=[ip for ip in old_roles if ip not in new_roles],
+                         changed_nodes=[ip for ip, role in new_roles.items()
+                                        if ip in old_roles and old_roles[ip] != role])
@@ -1,18 +1,16 @@
-from PySide6.QtCore import QObject, Signal, Property
+from infrastructure.shared_models.shared_model import SharedModel
+from models.changeSet import ChangeSet
 
 
-class SharedIsMaster(QObject):
-    dataChanged = Signal()
+class SharedIsMaster(SharedModel):
 
     def __init__(self, initial: bool):
-        super().__init__()
-        self._data = initial
+        super().__init__(initial)
 
-    def _get_data(self):
-        return self._data
+    @staticmethod
+    def _copy(data):
+        return data  # A bool is already immutable
 
-    def _set_data(self, new):
-        self._data = new
-        self.dataChanged.emit()
-
-    data: bool = Property(object, _get_data, _set_data, notify=dataChanged)
+    @staticmethod
+    def _diff(old: bool, new: bool) -> ChangeSet:
+        return ChangeSet(full=old != new)
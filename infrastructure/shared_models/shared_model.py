@@ -0,0 +1,108 @@
+import threading
+from contextlib import ExitStack, contextmanager
+
+from PySide6.QtCore import QObject, Signal, Property
+
+from models.changeSet import ChangeSet
+
+
+class SharedModel(QObject):
+    """
+    Data shared between the backend threads and the GUI, published as immutable snapshots.
+
+    Readers (the GUI, the serializers, the data saver...) take a reference to the current snapshot with `data`,
+    without lock and without copy, and must never modify it. Writers modify a copy of the snapshot in `mutate()`,
+    which is published atomically when the block ends. Writers are serialized, so no change is lost.
+
+    Every publication emits dataChanged, and `changed` with the ChangeSet between the previous and the new snapshot,
+    so the listeners can react only to what changed. Changes made inside `batch()` are notified once, with the
+    merged ChangeSet, when the outermost batch ends.
+    """
+
+    dataChanged = Signal()
+    changed = Signal(object)
+
+    def __init__(self, initial):
+        super().__init__()
+        self._data = initial
+        self._write_lock = threading.RLock()
+        # Depth of the batches opened by the current thread, and the changes they hold
+        self._batch = threading.local()
+
+    def _get_data(self):
+        return self._data
+
+    def _set_data(self, new):
+        # Replacing the whole snapshot is already atomic
+        with self._write_lock:
+            old, self._data = self._data, new
+            changes = self._diff(old, new)
+        self._notify(changes)
+
+    data = Property(object, _get_data, _set_data, notify=dataChanged)
+
+    @staticmethod
+    def _copy(data):
+        """Copy of a snapshot, to be modified by a writer. Models sharing the unchanged parts keep it cheap."""
+        return data.clone()
+
+    @staticmethod
+    def _diff(old, new) -> ChangeSet:
+        """Changes between two snapshots. Models without a finer description consider everything changed."""
+        return ChangeSet(full=old is not new)
+
+    @contextmanager
+    def mutate(self):
+        """
+        Modify the shared data: `with shared.mutate() as draft: ...`
+        The draft is published when the block ends, and dropped if it raises or if it changed nothing.
+        """
+        with self._write_lock:
+            draft = self._copy(self._data)
+            yield draft
+            changes = self._diff(self._data, draft)
+            if changes.is_empty():
+                return
+            self._data = draft
+        self._notify(changes)
+
+    def _notify(self, changes: ChangeSet):
+        batch = self._batch
+        if getattr(batch, "depth", 0):
+            batch.changes = changes if batch.changes is None else batch.changes.merge(changes)
+            return
+        self._emit(changes)
+
+    def _emit(self, changes: ChangeSet):
+        self.dataChanged.emit()
+        self.changed.emit(changes)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group the changes made in the block into a single notification, emitted when the block ends.
+        Batches may be nested, the signal is only emitted by the outermost one. A batch only holds the changes made
+        by its own thread, the other threads keep notifying theirs right away.
+        """
+        batch = self._batch
+        if not getattr(batch, "depth", 0):
+            batch.depth = 0
+            batch.changes = None
+        batch.depth += 1
+        try:
+            yield self
+        finally:
+            batch.depth -= 1
+            if not batch.depth:
+                changes, batch.changes = batch.changes, None
+                if changes is not None:
+                    self._emit(changes)
+
+
+@contextmanager
+def batch(*models: SharedModel):
+    """Batch the changes of several shared models at once, each one notifies at most once when the block ends."""
+    with ExitStack() as stack:
+        for model in models:
+            stack.enter_context(model.batch())
+        yield
@@ -1,25 +1,49 @@
-from PySide6.QtCore import QObject, Signal, Property
+from typing import Callable
 
+from infrastructure.shared_models.shared_model import SharedModel
+from models.changeSet import ChangeSet
 from models.serversData import ServersData
 
 
-class SharedServersData(QObject):
-    dataChanged = Signal()
+class SharedServersData(SharedModel):
 
     def __init__(self, initial: ServersData):
-        super().__init__()
-        self._data = initial
-
-    def _get_data(self):
-        return self._data
-
-    def _set_data(self, new):
-        print("Setting shared server data...")
-        self._data = new
-        self.dataChanged.emit()
-
-    data: ServersData = Property(object, _get_data, _set_data, notify=dataChanged)
+        super().__init__(initial)
+        self._refresh_handler: Callable[[str], None] | None = None
 
     @property
     def typed_data(self) -> ServersData:
-        return self._data
\ No newline at end of file
+        return self._data
+
+    @staticmethod
+    def _diff(old: ServersData, new: ServersData) -> ChangeSet:
+        old_list = old.servers_list or []
+        new_list = new.servers_list or []
+        if len(old_list) != len(new_list):
+            return ChangeSet(full=True)
+
+        # The poll times are not compared field by field, a poll finding nothing new only moves them
+        changes = ChangeSet(polled=old.last_update != new.last_update)
+        for old_element, new_element in zip(old_list, new_list):
+            # Snapshots share the elements that did not change
+            if old_element is new_element:
+                continue
+
+            fields = old_element.changed_fields(new_element)
+            if "host" in fields:
+                return ChangeSet(full=True)  # Rows are identified by their host
+            if fields:
+                changes.changed_servers.setdefault(new_element.host, set()).update(fields)
+        return changes
+
+    def set_refresh_handler(self, handler: Callable[[str], None]):
+        """Register the backend function that polls a single host again."""
+        self._refresh_handler = handler
+
+    def refresh_host(self, host: str):
+        """
+        Poll the given host again and update its server. Blocks until done, must not be called from the GUI thread.
+        """
+        if self._refresh_handler is None:
+            raise RuntimeError("No backend is able to refresh the servers")
+        self._refresh_handler(host)
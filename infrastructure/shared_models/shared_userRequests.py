@@ -1,20 +1,38 @@
-from PySide6.QtCore import QObject, Signal, Property
+from typing import Callable
 
+from infrastructure.shared_models.shared_model import SharedModel
+from models.changeSet import ChangeSet
+from models.userRequest import UserRequest
 from models.usersRequests import UsersRequests
 
 
-class SharedUserRequests(QObject):
-    dataChanged = Signal()
+class SharedUserRequests(SharedModel):
 
     def __init__(self, initial: UsersRequests):
-        super().__init__()
-        self._data = initial
+        super().__init__(initial)
+        self._request_sender: Callable[[UserRequest], None] | None = None
 
-    def _get_data(self):
+    @property
+    def typed_data(self) -> UsersRequests:
         return self._data
 
-    def _set_data(self, new):
-        self._data = new
-        self.dataChanged.emit()
+    def set_request_sender(self, sender: Callable[[UserRequest], None]):
+        """Register the backend function that sends a request created by the user to the master."""
+        self._request_sender = sender
 
-    data: UsersRequests = Property(object, _get_data, _set_data, notify=dataChanged)
+    def submit(self, request: UserRequest):
+        """
+        Add a request created by the user, and send it to the master. Only the requests submitted here are sent:
+        the ones received from the master are already known to it.
+        """
+        with self.mutate() as users_requests:
+            users_requests.add(request)
+        if self._request_sender is not None:
+            self._request_sender(request)
+
+    @staticmethod
+    def _diff(old: UsersRequests, new: UsersRequests) -> ChangeSet:
+        old_keys = {request.key() for request in old.requests}
+        new_keys = {request.key() for request in new.requests}
+        return ChangeSet(added_requests=[request for request in new.requests if request.key() not in old_keys],
+                         removed_requests=[request for request in old.requests if request.key() not in new_keys])
@@ -0,0 +1,69 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from infrastructure.config_parser import ConfigParser
+from infrastructure.ssh_pool import SshConnectionPool
+from infrastructure.ssh_sender import run_commands
+from models.hostPollResult import HostPollResult
+
+# Command run on the hosts to read each field of a ServerElement
+POLLED_FIELDS: dict[str, str] = {"app": "rpmqa", "status": "Status", "env": "domains"}
+
+
+class SshPoller:
+    """
+    Poll the hosts over SSH in parallel, with at most SSH_MAX_WORKERS connections at the same time.
+    A sweep takes about as long as the slowest host, and never longer than the SSH timeout.
+    """
+
+    def __init__(self, config: ConfigParser):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.config = config
+        self.timeout: float = config.SSH_TIMEOUT / 1000
+        self.executor = ThreadPoolExecutor(max_workers=config.SSH_MAX_WORKERS, thread_name_prefix="ssh-poller")
+        self.pool = SshConnectionPool(config)
+
+    def poll_host(self, host: str) -> HostPollResult:
+        try:
+            responses = self.pool.run(host, self._run_polled_commands, self.timeout)
+        except Exception as e:
+            self.logger.warning(f"Failed to poll host {host}: {e}")
+            return HostPollResult(host, error=str(e))
+
+        return HostPollResult(host, {name: responses.get(command, "") for name, command in POLLED_FIELDS.items()})
+
+    def _run_polled_commands(self, client) -> dict[str, str]:
+        return run_commands(client, set(POLLED_FIELDS.values()), self.timeout)
+
+    def poll_hosts(self, hosts: list[str]) -> dict[str, HostPollResult]:
+        """
+        Poll every given host once, even if it appears several times.
+        :return: the result of every host, hosts that did not answer in time get a failed result
+        """
+        futures = {self.executor.submit(self.poll_host, host): host for host in dict.fromkeys(hosts)}
+
+        # Hosts wait for a free worker, so the whole sweep is allowed one timeout per batch of workers
+        batches = -(-len(futures) // self.config.SSH_MAX_WORKERS)
+        done, not_done = wait(futures, timeout=self.timeout * max(batches, 1))
+
+        results = {}
+        for future in done:
+            result = future.result()
+            results[result.host] = result
+
+        for future in not_done:
+            future.cancel()
+            host = futures[future]
+            self.logger.warning(f"Timed out polling host {host}")
+            results[host] = HostPollResult(host, error="Timed out")
+
+        self.pool.evict_idle()
+        return results
+
+    def close_connections(self):
+        """Close the pooled connections, the poller may still be used afterwards."""
+        self.pool.close_all()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close_all()
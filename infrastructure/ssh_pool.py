@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, TypeVar
+
+import paramiko
+
+from infrastructure.config_parser import ConfigParser
+
+T = TypeVar("T")
+
+
+class _PooledClient:
+
+    def __init__(self, client: paramiko.SSHClient):
+        self.client = client
+        self.last_used: float = time.time()
+
+    def is_active(self) -> bool:
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+
+class SshConnectionPool:
+    """
+    Keep an authenticated SSH connection alive for every host across the polling cycles, so polling a host again
+    only costs opening a channel.
+
+    Connections unused for SSH_IDLE_TIMEOUT are closed, and the least recently used ones are closed when more than
+    SSH_POOL_SIZE hosts are connected. Keepalives prevent the servers and firewalls from dropping the idle ones.
+    """
+
+    def __init__(self, config: ConfigParser):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.config = config
+        self.max_size: int = config.SSH_POOL_SIZE
+        self.idle_timeout: float = config.SSH_IDLE_TIMEOUT / 1000
+        self.keepalive_interval: int = config.SSH_KEEPALIVE_INTERVAL // 1000
+
+        self._clients: OrderedDict[str, _PooledClient] = OrderedDict()  # From the least to the most recently used
+        self._lock = threading.Lock()
+        # Only for the hosts being connected or in the pool, the lock of a host is dropped with its connection
+        self._host_locks: dict[str, threading.Lock] = {}
+
+    def run(self, host: str, action: Callable[[paramiko.SSHClient], T], timeout: float | None = None) -> T:
+        """
+        Run an action with the connection to the given host.
+        If the pooled connection turned out to be broken, it is replaced and the action is tried once more.
+        """
+        client = self.get_client(host, timeout)
+        try:
+            return action(client)
+        except TimeoutError:
+            raise  # The host is slow, not the connection broken
+        except (paramiko.SSHException, EOFError, OSError) as e:
+            self.logger.info(f"Connection to {host} failed, reconnecting: {e}")
+            self.discard(host)
+
+        return action(self.get_client(host, timeout))
+
+    def get_client(self, host: str, timeout: float | None = None) -> paramiko.SSHClient:
+        client = self._get_pooled(host)
+        if client is not None:
+            return client
+
+        # Only one thread connects to a given host at a time, the other ones reuse its connection
+        try:
+            with self._get_host_lock(host):
+                client = self._get_pooled(host)
+                if client is not None:
+                    return client
+
+                client = self._connect(host, timeout)
+                with self._lock:
+                    entry = self._clients.setdefault(host, _PooledClient(client))
+                    evicted = self._pop_over_size()
+        except Exception:
+            # The host may stay unreachable, its lock is not kept
+            with self._lock:
+                if host not in self._clients:
+                    self._drop_host_lock(host)
+            raise
+
+        if entry.client is not client:
+            # Connected at the same time by a thread holding a lock dropped meanwhile, the pooled one is kept
+            evicted.append(_PooledClient(client))
+        self._close(evicted)
+        return entry.client
+
+    def _get_pooled(self, host: str) -> paramiko.SSHClient | None:
+        with self._lock:
+            entry = self._clients.get(host)
+            if entry is None:
+                return None
+
+            if not entry.is_active():
+                del self._clients[host]
+                self._drop_host_lock(host)
+                evicted = [entry]
+            else:
+                entry.last_used = time.time()
+                self._clients.move_to_end(host)
+                return entry.client
+
+        self._close(evicted)
+        return None
+
+    def _get_host_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _drop_host_lock(self, host: str):
+        """Must be called with the pool lock held, when the connection of the host leaves the pool."""
+        host_lock = self._host_locks.get(host)
+        if host_lock is not None and not host_lock.locked():
+            del self._host_locks[host]
+
+    def _connect(self, host: str, timeout: float | None) -> paramiko.SSHClient:
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        self.logger.info(f"Connecting to {host}:{self.config.SSH_PORT} as {self.config.SSH_USERNAME}")
+        client.connect(hostname=host, port=self.config.SSH_PORT, username=self.config.SSH_USERNAME,
+                       password=self.config.SSH_PASSWORD, timeout=timeout, banner_timeout=timeout,
+                       auth_timeout=timeout)
+        client.get_transport().set_keepalive(self.keepalive_interval)
+        return client
+
+    def _pop_over_size(self) -> list[_PooledClient]:
+        evicted = []
+        while len(self._clients) > self.max_size:
+            host, entry = self._clients.popitem(last=False)
+            self._drop_host_lock(host)
+            evicted.append(entry)
+        return evicted
+
+    def evict_idle(self):
+        deadline = time.time() - self.idle_timeout
+        with self._lock:
+            idle_hosts = [host for host, entry in self._clients.items() if entry.last_used < deadline]
+            evicted = [self._clients.pop(host) for host in idle_hosts]
+            for host in idle_hosts:
+                self._drop_host_lock(host)
+
+        if evicted:
+            self.logger.info(f"Closing {len(evicted)} idle SSH connections")
+        self._close(evicted)
+
+    def discard(self, host: str):
+        with self._lock:
+            entry = self._clients.pop(host, None)
+            self._drop_host_lock(host)
+        self._close([entry] if entry else [])
+
+    def close_all(self):
+        with self._lock:
+            evicted = list(self._clients.values())
+            for host in self._clients:
+                self._drop_host_lock(host)
+            self._clients.clear()
+        self._close(evicted)
+
+    @staticmethod
+    def _close(entries: list[_PooledClient]):
+        for entry in entries:
+            try:
+                entry.client.close()
+            except Exception:
+                pass
@@ -1,50 +1,62 @@
-import time
-
 import paramiko
 
 from infrastructure.config_parser import ConfigParser
 
 
-def ssh_echo_test(config: ConfigParser, host: str, commands: set[str]):
+class SshCommandError(Exception):
+    """Raised when a command run over SSH exits with a non-zero status."""
+
+
+def ssh_echo_test(config: ConfigParser, host: str, commands: set[str], timeout: float | None = None):
     # 1) Create client and auto‑add host key (since our server auto‑generates)
     client = paramiko.SSHClient()
     client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
     # 2) Connect
     print(f"Connecting to {host}:{config.SSH_PORT} as {config.SSH_USERNAME}…")
-    client.connect(hostname=host, port=config.SSH_PORT, username=config.SSH_USERNAME, password=config.SSH_PASSWORD)
+    client.connect(hostname=host, port=config.SSH_PORT, username=config.SSH_USERNAME, password=config.SSH_PASSWORD,
+                   timeout=timeout, banner_timeout=timeout, auth_timeout=timeout)
     print("Connected!")
 
-    # 3) Open a shell channel
-    chan = client.invoke_shell()
-    time.sleep(0.5)  # give server time to send its welcome banner
-
-    # 4) Read initial banner
-    if chan.recv_ready():
-        banner = chan.recv(1024).decode('utf-8')
-        print("Server banner:", banner.strip())
-
-    # Prepare dict to collect responses
-    responses: dict[str, str] = {}
-
-    # 5) Send a few messages and print echoes
-    for command in commands:
-        print(f"--> {command}")
-        chan.send(command + "\n")
-        time.sleep(0.2)  # wait for echo
-
-        # Read all available data for this command
-        buffer = []
-        while chan.recv_ready():
-            chunk = chan.recv(1024).decode('utf-8')
-            buffer.append(chunk)
-
-        response = "".join(buffer).strip()
-        responses[command] = response
-
-    # 6) Close channel and connection
-    chan.close()
-    client.close()
-    print("Disconnected.")
-
-    return responses
+    try:
+        return run_commands(client, commands, timeout)
+    finally:
+        # 3) Close connection
+        client.close()
+        print("Disconnected.")
+
+
+def run_commands(client: paramiko.SSHClient, commands: set[str], timeout: float | None = None) -> dict[str, str]:
+    """
+    Run every command on its own exec channel of the client's transport, and read its output until it exits.
+    All the commands are started before reading any output, so they run concurrently on the host, and the whole
+    call lasts as long as the slowest command. Only the channels are closed, so the connection can be reused.
+    :return: the output of every command
+    :raise SshCommandError: if a command exited with a non-zero status
+    """
+    transport = client.get_transport()
+    channels: dict[str, paramiko.Channel] = {}
+
+    try:
+        for command in commands:
+            chan = transport.open_session(timeout=timeout)
+            chan.settimeout(timeout)
+            chan.set_combine_stderr(True)  # A single stream to drain, so the command can never block on stderr
+            chan.exec_command(command)
+            channels[command] = chan
+
+        responses: dict[str, str] = {}
+        for command, chan in channels.items():
+            # Read until the command closes its output, then get its exit status
+            output = chan.makefile("rb").read()
+            exit_status = chan.recv_exit_status()
+            if exit_status != 0:
+                raise SshCommandError(f"Command '{command}' exited with status {exit_status}: {output[:200]!r}")
+
+            responses[command] = output.decode("utf-8", errors="replace").strip()
+
+        return responses
+
+    finally:
+        for chan in channels.values():
+            chan.close()
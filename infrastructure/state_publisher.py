@@ -0,0 +1,119 @@
+import logging
+import threading
+from typing import Callable
+
+from infrastructure.encoded_response_cache import EncodedResponseCache
+from infrastructure.framed_socket import FramedSocket
+from infrastructure.messages.generalMessage import GeneralMessage
+from infrastructure.messages.stateNotModifiedMessage import StateNotModifiedMessage
+
+
+class StatePublisher:
+    """
+    Push the state to every subscribed slave as soon as it changes.
+    All the changes notified within the coalescing window are sent as a single update.
+
+    The pushes to a slave are serialized by a lock of its own, so they reach it in order of revision, and a slow
+    slave never holds the others. A slave not taking a push within the send timeout is unsubscribed and disconnected.
+    """
+
+    def __init__(self, build_response: Callable[[int], GeneralMessage], coalesce_interval: float,
+                 response_cache: EncodedResponseCache, send_timeout: float | None = None):
+        """
+        :param build_response: build the message bringing a slave from the given revision to the current one
+        :param coalesce_interval: time to wait after a change for the next ones, in seconds
+        :param response_cache: encodes the responses once for all the subscribers at the same revision
+        :param send_timeout: time given to a slave to take a push, in seconds. The timeout of its socket when None
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.build_response = build_response
+        self.coalesce_interval = coalesce_interval
+        self.response_cache = response_cache
+        self.send_timeout = send_timeout
+
+        # Last revision sent to each subscribed connection, and the lock serializing the pushes to it
+        self._subscribers: dict[FramedSocket, int] = {}
+        self._push_locks: dict[FramedSocket, threading.Lock] = {}
+        self._subscribers_lock = threading.Lock()
+        self._changed_event = threading.Event()
+
+    def subscribe(self, connection: FramedSocket, revision: int):
+        with self._subscribers_lock:
+            self._subscribers[connection] = revision
+            self._push_locks.setdefault(connection, threading.Lock())
+
+        # Bring the new subscriber up-to-date right away
+        self._publish_to(connection)
+
+    def unsubscribe(self, connection: FramedSocket):
+        with self._subscribers_lock:
+            self._subscribers.pop(connection, None)
+            self._push_locks.pop(connection, None)
+
+    def is_subscribed(self, connection: FramedSocket) -> bool:
+        with self._subscribers_lock:
+            return connection in self._subscribers
+
+    def notify(self):
+        self._changed_event.set()
+
+    def take_change(self) -> bool:
+        """
+        :return: True if a change has been notified since the last call
+        """
+        changed = self._changed_event.is_set()
+        self._changed_event.clear()
+        return changed
+
+    def run(self, stop_event: threading.Event):
+        self.logger.info(f"Thread <STATE_PUBLISHER> started!")
+
+        while not stop_event.is_set():
+            if not self._changed_event.wait(1):
+                continue
+
+            # Let the burst of changes finish before publishing
+            stop_event.wait(self.coalesce_interval)
+            self._changed_event.clear()
+            self.publish()
+
+        with self._subscribers_lock:
+            self._subscribers.clear()
+            self._push_locks.clear()
+        self.logger.info(f"Thread <STATE_PUBLISHER> is shutting down")
+
+    def publish(self):
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+
+        for connection in subscribers:
+            self._publish_to(connection)
+
+    def _publish_to(self, connection: FramedSocket):
+        with self._subscribers_lock:
+            push_lock = self._push_locks.get(connection)
+        if push_lock is None:
+            return
+
+        with push_lock:
+            with self._subscribers_lock:
+                if connection not in self._subscribers:
+                    return
+                revision = self._subscribers[connection]
+
+            response = self.build_response(revision)
+            if isinstance(response, StateNotModifiedMessage):
+                return
+
+            try:
+                connection.send_encoded(self.response_cache.encode(connection, response), self.send_timeout)
+            except OSError as e:
+                self.logger.warning(f"Failed to push the state to a subscriber, disconnecting it: {e}")
+                self.unsubscribe(connection)
+                # A push may have been sent in part, nothing else can be sent on this connection
+                connection.close()
+                return
+
+            with self._subscribers_lock:
+                if connection in self._subscribers:
+                    self._subscribers[connection] = response.revision
@@ -0,0 +1,233 @@
+import json
+import threading
+import zlib
+
+from models.clusterNode import ClusterNode
+from models.clusterView import ClusterView
+from models.serverElement import ServerElement
+from models.serversData import ServersData
+from models.stateDelta import StateDelta
+from models.userRequest import UserRequest
+from models.usersRequests import UsersRequests
+
+NO_REVISION = -1
+
+
+def request_key(request: dict) -> str:
+    return f"{request.get('nodeIP', '')}|{request.get('timestamp', 0)}|{request.get('host', '')}|{request.get('user', '')}"
+
+
+def same_server(known: dict, row: dict) -> bool:
+    """The time of the poll moves at every poll, it is carried along with the other fields but is not a change."""
+    return len(known) == len(row) and all(known.get(key) == value for key, value in row.items() if key != "lastUpdate")
+
+
+class StateTracker:
+    """
+    Versioned copy of the shared state (servers, cluster and requests).
+
+    The master captures its state whenever it has been marked as dirty. Every capture that finds a difference bumps
+    the revision, and stamps the changed rows with it, so the delta since any revision held by a slave is computed
+    without keeping old snapshots. The slave applies the deltas it receives and rebuilds its state from them.
+    """
+
+    def __init__(self, max_tombstones: int = 1000):
+        self.lock = threading.Lock()
+        self.max_tombstones = max_tombstones
+        self.revision: int = 0
+        self.horizon: int = 0  # Oldest revision from which a delta can still be computed
+        self.last_update: int = 0
+        self._dirty = True
+
+        # Rows of the state, and the revision at which each of them changed for the last time
+        self._servers: list[dict] = []
+        self._servers_revisions: list[int] = []
+        self._nodes: dict[str, dict] = {}
+        self._nodes_revisions: dict[str, int] = {}
+        self._requests: dict[str, dict] = {}
+        self._requests_revisions: dict[str, int] = {}
+
+        # Revision at which each row has been removed
+        self._removed_nodes: dict[str, int] = {}
+        self._removed_requests: dict[str, int] = {}
+
+        # Digest of the rows, computed again after they changed
+        self._digest: str | None = None
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def capture(self, servers_data: ServersData, cluster_view: ClusterView, user_requests: UsersRequests) -> int:
+        """
+        Compare the given state with the last captured one, and bump the revision if anything changed.
+        :return: the current revision
+        """
+        with self.lock:
+            if not self._dirty:
+                return self.revision
+            # Reset the flag before reading, so a change happening during the capture will trigger a new one
+            self._dirty = False
+
+            servers = [s.to_dict() for s in list(servers_data.servers_list or [])]
+            nodes = {n["nodeIP"]: n for n in cluster_view.to_list()}
+            requests = {request_key(r): r for r in user_requests.to_list()}
+            revision = self.revision + 1
+            changed = False
+
+            for index, row in enumerate(servers):
+                if index >= len(self._servers):
+                    self._servers.append(row)
+                    self._servers_revisions.append(revision)
+                    changed = True
+                elif not same_server(self._servers[index], row):
+                    self._servers[index] = row
+                    self._servers_revisions[index] = revision
+                    changed = True
+
+            if len(servers) < len(self._servers):
+                del self._servers[len(servers):]
+                del self._servers_revisions[len(servers):]
+                changed = True
+
+            changed |= self._capture_rows(nodes, self._nodes, self._nodes_revisions, self._removed_nodes, revision)
+            changed |= self._capture_rows(requests, self._requests, self._requests_revisions, self._removed_requests,
+                                          revision)
+
+            if changed:
+                self.revision = revision
+                self.last_update = servers_data.last_update
+                self._digest = None
+                self._prune_tombstones()
+
+            return self.revision
+
+    @staticmethod
+    def _capture_rows(rows: dict, known_rows: dict, revisions: dict, removed: dict, revision: int) -> bool:
+        changed = False
+        for key, row in rows.items():
+            if known_rows.get(key) != row:
+                known_rows[key] = row
+                revisions[key] = revision
+                removed.pop(key, None)
+                changed = True
+
+        for key in [key for key in known_rows if key not in rows]:
+            del known_rows[key]
+            del revisions[key]
+            removed[key] = revision
+            changed = True
+
+        return changed
+
+    def _prune_tombstones(self):
+        for removed in (self._removed_nodes, self._removed_requests):
+            if len(removed) <= self.max_tombstones:
+                continue
+
+            # Forget the oldest half. Slaves older than them will get a full state instead of a delta
+            oldest = sorted(removed.items(), key=lambda item: item[1])[:len(removed) // 2]
+            for key, _ in oldest:
+                del removed[key]
+            self.horizon = max(self.horizon, oldest[-1][1])
+
+    def delta_since(self, base_revision: int) -> StateDelta | None:
+        """
+        :return: the changes between the given revision and the current one, or None if the given revision is
+                 unknown and a full state must be sent instead
+        """
+        with self.lock:
+            if base_revision == NO_REVISION or base_revision < self.horizon or base_revision > self.revision:
+                return None
+
+            return StateDelta(
+                base_revision=base_revision,
+                revision=self.revision,
+                last_update=self.last_update,
+                servers_count=len(self._servers),
+                changed_servers=[(index, row) for index, (row, revision) in
+                                 enumerate(zip(self._servers, self._servers_revisions)) if revision > base_revision],
+                changed_nodes=[row for key, row in self._nodes.items() if self._nodes_revisions[key] > base_revision],
+                removed_nodes=[key for key, revision in self._removed_nodes.items() if revision > base_revision],
+                added_requests=[row for key, row in self._requests.items()
+                                if self._requests_revisions[key] > base_revision],
+                removed_requests=[key for key, revision in self._removed_requests.items()
+                                  if revision > base_revision])
+
+    def reset(self, revision: int, servers_data: ServersData, cluster_view: ClusterView,
+              user_requests: UsersRequests):
+        """Replace the tracked state by a full state received from the master."""
+        with self.lock:
+            self.revision = revision
+            self.horizon = revision
+            self.last_update = servers_data.last_update
+            self._servers = [s.to_dict() for s in servers_data.servers_list or []]
+            self._servers_revisions = [revision] * len(self._servers)
+            self._nodes = {n["nodeIP"]: n for n in cluster_view.to_list()}
+            self._nodes_revisions = dict.fromkeys(self._nodes, revision)
+            self._requests = {request_key(r): r for r in user_requests.to_list()}
+            self._requests_revisions = dict.fromkeys(self._requests, revision)
+            self._removed_nodes.clear()
+            self._removed_requests.clear()
+            self._digest = None
+
+    def apply_delta(self, delta: StateDelta):
+        """Apply a delta received from the master on the tracked state."""
+        with self.lock:
+            del self._servers[delta.servers_count:]
+            del self._servers_revisions[delta.servers_count:]
+            for index, row in delta.changed_servers:
+                while index >= len(self._servers):
+                    self._servers.append({})
+                    self._servers_revisions.append(delta.revision)
+                self._servers[index] = row
+                self._servers_revisions[index] = delta.revision
+
+            for row in delta.changed_nodes:
+                self._nodes[row["nodeIP"]] = row
+                self._nodes_revisions[row["nodeIP"]] = delta.revision
+            for key in delta.removed_nodes:
+                self._nodes.pop(key, None)
+                self._nodes_revisions.pop(key, None)
+
+            for key in delta.removed_requests:
+                self._requests.pop(key, None)
+                self._requests_revisions.pop(key, None)
+            for row in delta.added_requests:
+                self._requests[request_key(row)] = row
+                self._requests_revisions[request_key(row)] = delta.revision
+
+            self.last_update = delta.last_update
+            self.revision = delta.revision
+            self._digest = None
+
+    def digest(self) -> str:
+        """
+        Short digest of the tracked rows. A slave holding the same state as its master, at the same revision, has the
+        same digest, whatever the order in which it received the nodes and the requests.
+        """
+        with self.lock:
+            if self._digest is None:
+                content = json.dumps([self.last_update, self._servers, sorted(self._nodes.items()),
+                                      sorted(self._requests.items())], sort_keys=True)
+                self._digest = f"{zlib.crc32(content.encode()):08x}"
+            return self._digest
+
+    def build_state(self) -> tuple[ServersData, ClusterView, UsersRequests]:
+        """Build new model objects from the tracked state."""
+        return self.snapshot()[1:]
+
+    def snapshot(self) -> tuple[int, ServersData, ClusterView, UsersRequests]:
+        """
+        Build new model objects from the tracked state, along with its revision. They are read at once, so the state
+        is exactly the one of the revision, and has its digest.
+        """
+        with self.lock:
+            servers_data = ServersData(self.last_update, [ServerElement().from_json(row) for row in self._servers])
+
+            cluster_view = ClusterView()
+            cluster_view.nodes = [ClusterNode().from_json(row) for row in self._nodes.values()]
+
+            user_requests = UsersRequests()
+            user_requests.requests = [UserRequest().from_json(row) for row in self._requests.values()]
+
+            return self.revision, servers_data, cluster_view, user_requests
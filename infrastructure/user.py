@@ -1,11 +1,15 @@
 import json
 import logging
+import secrets
 import socket
 import threading
 import time
 from pathlib import Path
 
+from infrastructure.async_network_core import AsyncNetworkCore
 from infrastructure.config_parser import ConfigParser
+from infrastructure.encoded_response_cache import EncodedResponseCache
+from infrastructure.framed_socket import FramedSocket, FramingError
 from infrastructure.messages.actionRequestMessage import ActionRequestMessage
 from infrastructure.messages.fetchStateMessage import FetchStateMessage
 from infrastructure.messages.forceMasterMessage import ForceMasterMessage
@@ -13,18 +17,26 @@ from infrastructure.messages.heartbeatMessage import HeartBeatMessage
 from infrastructure.messages.joinRequestMessage import JoinRequestMessage
 from infrastructure.messages.joinResponseMessage import JoinResponseMessage
 from infrastructure.messages.leaveNotificationMessage import LeaveNotificationMessage
+from infrastructure.message_codec import JSON_CODEC, MessageCodec, available_codecs, get_codec, negotiate_codec
 from infrastructure.message_deserializer import MessageDeserializer
+from infrastructure.messages.stateDeltaMessage import StateDeltaMessage
+from infrastructure.messages.stateNotModifiedMessage import StateNotModifiedMessage
 from infrastructure.messages.stateUpdateMessage import StateUpdateMessage
+from infrastructure.messages.subscribeStateMessage import SubscribeStateMessage
 from infrastructure.ip_manager import IpManager
+from infrastructure.polling_scheduler import PollingScheduler
 from infrastructure.shared_models.shared_clusterView import SharedClusterView
 from infrastructure.shared_models.shared_isMaster import SharedIsMaster
+from infrastructure.shared_models.shared_model import batch
 from infrastructure.shared_models.shared_serversData import SharedServersData
 from infrastructure.shared_models.shared_userRequests import SharedUserRequests
+from infrastructure.ssh_poller import SshPoller
+from infrastructure.state_publisher import StatePublisher
+from infrastructure.state_tracker import StateTracker, NO_REVISION
 from infrastructure.validator import validate_user_request
 from models.serversData import ServersData
 from models.role import Role
 from models.userRequest import UserRequest
-from models.usersRequests import UsersRequests
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s - %(message)s')
 
@@ -33,19 +45,29 @@ class User:
     def __init__(self, config: ConfigParser, shared_servers: SharedServersData, shared_cluster: SharedClusterView, shared_requests: SharedUserRequests, shared_is_master: SharedIsMaster):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config: ConfigParser = config
-        self.ip: str = IpManager.get_own_ip()
+        # The own address is read from IpManager when used, it follows the changes of the interfaces
+        IpManager.configure(self.config.LAN_ADDRESS)
         self.stop_core_event: threading.Event = threading.Event()
         self.stop_master_event = threading.Event()
         self.stop_slave_event = threading.Event()
         self.role: Role = Role.SLAVE
         self.master_ip: str = ""
+        self.master_revision: int = NO_REVISION  # Revision announced by the master when the user joined
+        # Identifies the term of the user as master, sent in its heartbeats
+        self.epoch: str = ""
+        # Epoch, revision and digest of the state announced by the last heartbeat of the master
+        self.master_state: tuple[str, int, str] | None = None
+        self.master_state_event = threading.Event()
         self.last_master_heartbeat: int = 0
         self.last_save: int = 0
 
         # Define UDP socket for sending
         self.udp_sender_socket = self.initialize_udp_sender_socket()
-        self.client_socket = None
-        self.client_socket_lock = threading.Lock()
+        # The UDP messages are handled one at a time, by the listener thread or the UDP executor
+        self.udp_deserializer: MessageDeserializer = MessageDeserializer()
+        self.client_socket: FramedSocket | None = None
+        # Codec of the TCP channel to the master, negotiated when joining the network
+        self.tcp_codec: MessageCodec = JSON_CODEC
 
         # Data
         self.shared_servers: SharedServersData = shared_servers
@@ -54,7 +76,29 @@ class User:
         self.shared_is_master: SharedIsMaster = shared_is_master
 
         self.shared_is_master.dataChanged.connect(self.start_role_tasks)
-        self.shared_requests.dataChanged.connect(self.send_request)
+        self.shared_requests.set_request_sender(self.send_request)
+
+        # Versioned state, used to answer FetchState with deltas
+        self.state_tracker: StateTracker = StateTracker()
+        # Encoded state responses, shared by all the slaves at the same revision
+        self.response_cache: EncodedResponseCache = EncodedResponseCache()
+        for shared in (self.shared_servers, self.shared_cluster, self.shared_requests):
+            shared.dataChanged.connect(self.state_tracker.mark_dirty)
+            shared.dataChanged.connect(self.response_cache.invalidate)
+
+        # Pushes the state changes to the subscribed slaves
+        self.state_publisher: StatePublisher = StatePublisher(self._state_response,
+                                                              self.config.PUSH_COALESCE_INTERVAL / 1000,
+                                                              self.response_cache,
+                                                              self.config.PUSH_SEND_TIMEOUT / 1000)
+        for shared in (self.shared_servers, self.shared_cluster, self.shared_requests):
+            shared.dataChanged.connect(self.state_publisher.notify)
+
+        # Polls the servers over SSH while the user is the master
+        self.ssh_poller: SshPoller = SshPoller(self.config)
+        self.polling_scheduler: PollingScheduler = PollingScheduler(self.config.SERVER_POLLING_INTERVAL / 1000,
+                                                                    self.config.SERVER_POLLING_MAX_INTERVAL / 1000)
+        self.shared_servers.set_refresh_handler(self.refresh_host)
 
         # Tasks
         self.heartbeat_sender_thread: threading.Thread = threading.Thread(target=self._heartbeat_sender, daemon=True)
@@ -63,8 +107,14 @@ class User:
         self.tcp_client_thread: threading.Thread = threading.Thread(target=self._tcp_client, daemon=True)
         self.ssh_polling_thread: threading.Thread = threading.Thread(target=self._ssh_polling, daemon=True)
         self.data_saver_thread: threading.Thread = threading.Thread(target=self._data_saver, daemon=True)
+        self.state_publisher_thread: threading.Thread = threading.Thread(target=self.state_publisher.run, args=(self.stop_master_event,), daemon=True)
         self.active_client_threads: list[threading.Thread] = []
 
+        # Optional event-loop backend, running the network tasks on a single thread
+        self.network_core: AsyncNetworkCore | None = None
+        if self.config.NETWORK_BACKEND == "asyncio":
+            self.network_core = AsyncNetworkCore(self)
+
     @staticmethod
     def initialize_udp_sender_socket():
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -72,7 +122,13 @@ class User:
         return sock
 
     def start(self):
-        self.udp_listener_thread.start()
+        # Keep the addresses of the interfaces up to date, without resolving names on the receive path
+        IpManager.start_refresh(self.config.INTERFACES_REFRESH_INTERVAL / 1000, self.stop_core_event)
+
+        if self.network_core is not None:
+            self.network_core.start()
+        else:
+            self.udp_listener_thread.start()
 
         # Request to join the network
         threading.Thread(target=self._join_network, daemon=True).start()
@@ -90,25 +146,21 @@ class User:
         else:
             self.start_slave_tasks()
 
-    def send_request(self):
+    def send_request(self, user_request: UserRequest):
         if self.shared_is_master.data:
             return
 
-        if not self.shared_requests.data.requests:
-
-            return
         if not self.client_socket:
             self.logger.warning("Socket not ready, cannot send request")
             return
 
-        message = ActionRequestMessage(self.shared_requests.data.requests[-1])
-        with self.client_socket_lock:
-            try:
-                self.client_socket.send(message.to_json().encode())
-                self.logger.info("Sent message of type ActionRequestMessage")
+        message = ActionRequestMessage(user_request)
+        try:
+            self.client_socket.send_message(message)
+            self.logger.info("Sent message of type ActionRequestMessage")
 
-            except Exception as e:
-                self.logger.error(f"Failed to send request: {e}")
+        except Exception as e:
+            self.logger.error(f"Failed to send request: {e}")
 
     def load_server_data(self):
         # Ensure the directory exists
@@ -130,10 +182,22 @@ class User:
 
         self.master_ip = IpManager.get_own_ip()
         self.role = Role.MASTER
+        self.epoch = secrets.token_hex(4)
 
         self.stop_slave_event.set()
         self.stop_master_event.clear()
 
+        if not self.ssh_polling_thread.is_alive():
+            self.ssh_polling_thread = threading.Thread(target=self._ssh_polling, daemon=True)
+            self.ssh_polling_thread.start()
+        else:
+            self.logger.warning(f"Thread <SSH_POLLING> was still alive. This is not the right behavior...")
+
+        if self.network_core is not None:
+            # The network tasks all run on the event loop
+            self.network_core.start_master()
+            return
+
         if not self.heartbeat_sender_thread.is_alive():
             self.heartbeat_sender_thread = threading.Thread(target=self._heartbeat_sender, daemon=True)
             self.heartbeat_sender_thread.start()
@@ -146,18 +210,17 @@ class User:
         else:
             self.logger.warning(f"Thread <TCP_SERVER> was still alive. This is not the right behavior...")
 
-        if not self.ssh_polling_thread.is_alive():
-            self.ssh_polling_thread = threading.Thread(target=self._ssh_polling, daemon=True)
-            self.ssh_polling_thread.start()
-        else:
-            self.logger.warning(f"Thread <SSH_POLLING> was still alive. This is not the right behavior...")
-
         if not self.data_saver_thread.is_alive():
             self.data_saver_thread = threading.Thread(target=self._data_saver, daemon=True)
             self.data_saver_thread.start()
         else:
             self.logger.warning(f"Thread <DATA_SAVER_THREAD> was still alive. This is not the right behavior...")
 
+        if not self.state_publisher_thread.is_alive():
+            self.state_publisher_thread = threading.Thread(target=self.state_publisher.run, args=(self.stop_master_event,), daemon=True)
+            self.state_publisher_thread.start()
+        else:
+            self.logger.warning(f"Thread <STATE_PUBLISHER> was still alive. This is not the right behavior...")
 
     def start_slave_tasks(self):
         self.logger.info("Starting Slave tasks")
@@ -198,7 +261,8 @@ class User:
                 self.logger.info(f'A new client connected at address {src_ip}')
                 thread = threading.Thread(target=self._handle_client, args=(connection, src_ip), daemon=True)
                 self.active_client_threads.append(thread)
-                self.shared_cluster.data.add_or_update(src_ip, Role.SLAVE)
+                with self.shared_cluster.mutate() as cluster_view:
+                    cluster_view.add_or_update(src_ip, Role.SLAVE)
                 thread.start()
             except socket.timeout:
                 continue
@@ -214,32 +278,100 @@ class User:
         self.logger.info(f"Thread <TCP_CLIENT> started!")
 
         try:
-            self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.client_socket.connect((self.master_ip, self.config.TCP_PORT))
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.connect((self.master_ip, self.config.TCP_PORT))
+            self.client_socket = FramedSocket(sock, self.tcp_codec, chunk_size=self.config.FRAME_CHUNK_SIZE,
+                                              compress_min_size=self.config.FRAME_COMPRESSION_MIN_SIZE)
             self.logger.info(f"Connected to master {self.master_ip}")
 
+            # Revisions are only meaningful for a given master, so always start with a full state
+            revision = NO_REVISION
+            next_fetch = 0
+            # The state is fetched when the heartbeats announce another one, and periodically if they don't announce
+            # any (older masters)
+            announced = False
+            fetch_requested = True
+            fetch_pending = False
+            held_epoch: str | None = None
+            self.master_state_event.clear()
+
+            # Wake up regularly to check the stop event, the framed socket keeps any partial frame across timeouts
+            self.client_socket.settimeout(1)
+
+            if self.config.STATE_SUBSCRIPTION:
+                # The master will push every change from now on
+                self.client_socket.send_message(SubscribeStateMessage(revision))
+                self.logger.info("Sent message of type SubscribeStateMessage")
+
+            deserializer = MessageDeserializer()
             while not self.stop_slave_event.is_set():
 
-                with self.client_socket_lock:
-                    self.client_socket.send(FetchStateMessage().to_json().encode())
-                self.logger.info("Sent message of type FetchStateMessage")
+                if self.master_state_event.is_set():
+                    self.master_state_event.clear()
+                    epoch, master_revision, digest = self.master_state
+                    announced = True
+
+                    # The revisions of another epoch can't be compared, and at the same revision the digests must match
+                    diverged = ((held_epoch is not None and epoch != held_epoch) or
+                                (master_revision == revision and digest != self.state_tracker.digest()))
+                    held_epoch = epoch
+                    if diverged:
+                        self.logger.warning(f"State diverged from master {self.master_ip}, fetching it again")
+                        revision = NO_REVISION
+                        fetch_pending = False
+                        if self.config.STATE_SUBSCRIPTION:
+                            self.client_socket.send_message(SubscribeStateMessage(revision))
+
+                    fetch_requested |= master_revision != revision
+
+                due = time.time() >= next_fetch
+                waiting = fetch_pending and not due  # The answer to the last fetch may still come
+                if not self.config.STATE_SUBSCRIPTION and not waiting and (
+                        fetch_requested or (not announced and due)):
+                    self.client_socket.send_message(FetchStateMessage(revision))
+                    self.logger.info("Sent message of type FetchStateMessage")
+                    next_fetch = time.time() + self.config.FETCH_INTERVAL / 1000
+                    fetch_requested = False
+                    fetch_pending = True
 
-                data = self.client_socket.recv(8192)
+                try:
+                    msg = self.client_socket.receive()
+                except socket.timeout:
+                    continue
 
-                if not data:
+                if msg is None:
                     self.logger.warning("Master closed connection unexpectedly.")
                     break
 
-                msg = json.loads(data.decode())
-                message = MessageDeserializer().deserialize(msg)
+                message = deserializer.deserialize(msg)
+                if message is None:
+                    continue
                 self.logger.info(f"Fetched message of type {message.get_name()}")
+                fetch_pending = False
 
                 if isinstance(message, StateUpdateMessage):
-                    self.shared_servers.data = message.servers_data
-                    self.shared_cluster.data = message.cluster_view
-                    self.shared_requests.data = message.user_requests
-
-                self.stop_slave_event.wait(self.config.FETCH_INTERVAL / 1000)
+                    if revision == NO_REVISION:
+                        self.logger.info(f"Acquired the state of master {self.master_ip} at revision "
+                                         f"{message.revision} (announced {self.master_revision})")
+                    self.state_tracker.reset(message.revision, message.servers_data, message.cluster_view,
+                                             message.user_requests)
+                    with batch(self.shared_servers, self.shared_cluster, self.shared_requests):
+                        self.shared_servers.data = message.servers_data
+                        self.shared_cluster.data = message.cluster_view
+                        self.shared_requests.data = message.user_requests
+                    revision = message.revision
+
+                elif isinstance(message, StateDeltaMessage):
+                    self.state_tracker.apply_delta(message.delta)
+                    servers_data, cluster_view, user_requests = self.state_tracker.build_state()
+                    with batch(self.shared_servers, self.shared_cluster, self.shared_requests):
+                        self.shared_servers.data = servers_data
+                        self.shared_cluster.data = cluster_view
+                        self.shared_requests.data = user_requests
+                    revision = message.delta.revision
+
+                elif isinstance(message, StateNotModifiedMessage):
+                    revision = message.revision
 
             self.client_socket.close()
             self.client_socket = None
@@ -250,6 +382,9 @@ class User:
         except (ConnectionResetError, OSError) as e:
             self.logger.warning(f"Connection lost from master {self.master_ip}: {e}")
 
+        except FramingError as e:
+            self.logger.error(f"Corrupted stream from master {self.master_ip}: {e}")
+
         finally:
             if self.client_socket is not None:
                 try:
@@ -257,27 +392,38 @@ class User:
                     self.logger.info("TCP client socket closed.")
                 except Exception:
                     pass
+                self.client_socket = None
 
             self.logger.info(f"Thread <TCP_CLIENT> is shutting down")
 
     def _handle_client(self, connection, client_ip):
+        connection = FramedSocket(connection, chunk_size=self.config.FRAME_CHUNK_SIZE,
+                                  compress_min_size=self.config.FRAME_COMPRESSION_MIN_SIZE)
+        deserializer = MessageDeserializer()
+
         while not self.stop_master_event.is_set():
             msg = None
             try:
-                data = connection.recv(4096)
-                if not data:  # Client closed cleanly
+                msg = connection.receive()
+                if msg is None:  # Client closed cleanly
                     self.logger.info(f"Client {client_ip} closed the connection.")
                     break
 
-                msg = json.loads(data.decode())
-                message = MessageDeserializer().deserialize(msg)
+                message = deserializer.deserialize(msg)
+
+            except socket.timeout:
+                if self.state_publisher.is_subscribed(connection):
+                    continue  # Subscribed slaves only talk when they have a request to send
+
+                self.logger.warning(f"Timed out waiting for data from client {client_ip}. Disconnecting.")
+                break
 
             except (ConnectionResetError, OSError) as e:
                 self.logger.warning(f"Client {client_ip} disconnected abruptly: {e}")
                 break
 
-            except socket.timeout:
-                self.logger.warning(f"Timed out waiting for data from client {client_ip}. Disconnecting.")
+            except FramingError as e:
+                self.logger.error(f"Corrupted stream from client {client_ip}. Disconnecting: {e}")
                 break
 
             except Exception as e:
@@ -285,37 +431,81 @@ class User:
                 self.logger.error(f"msg: {msg}")
                 continue
 
-            self.logger.info(f"Got message of type {message.get_name()}")
+            self.process_client_message(message, connection, client_ip)
+
+        self.state_publisher.unsubscribe(connection)
+        connection.close()
+        with self.shared_cluster.mutate() as cluster_view:
+            cluster_view.remove(client_ip)
+        self.logger.warning(f"Socket of client {client_ip} has been closed.")
+
+    def process_client_message(self, message, connection, client_ip):
+        """
+        Handle a message received by the master from one of its slaves.
+        :param connection: connection of the slave, used to answer it
+        """
+        if message is None:
+            return
+
+        self.logger.info(f"Got message of type {message.get_name()}")
 
-            if isinstance(message, FetchStateMessage):
-                response = StateUpdateMessage(self.shared_servers.data, self.shared_cluster.data, self.shared_requests.data)
-                connection.send(response.to_json().encode())
-                self.logger.info(f"Sent message of type {response.get_name()}")
+        if isinstance(message, FetchStateMessage):
+            response = self._state_response(message.revision)
+            if isinstance(response, StateNotModifiedMessage):
+                connection.send_message(response)
+            else:
+                self.response_cache.send(connection, response)
+            self.logger.info(f"Sent message of type {response.get_name()}")
 
-            elif isinstance(message, ActionRequestMessage):
-                user_request: UserRequest = message.user_request
-                if validate_user_request(self.shared_servers.data, user_request):
-                    requests_list: UsersRequests = self.shared_requests.data
+        elif isinstance(message, SubscribeStateMessage):
+            self.state_publisher.subscribe(connection, message.revision)
+            self.logger.info(f"Client {client_ip} subscribed to the state updates")
+
+        elif isinstance(message, ActionRequestMessage):
+            user_request: UserRequest = message.user_request
+            if validate_user_request(self.shared_servers.data, user_request):
+                with self.shared_requests.mutate() as requests_list:
                     requests_list.add(user_request)
-                    self.logger.info(f"A new request from {client_ip} has been added to the requests list")
+                self.logger.info(f"A new request from {client_ip} has been added to the requests list")
 
-                else:
-                    self.logger.warning(f"Got an invalid request from {client_ip}: user {user_request.user}, host {user_request.host}")
-        connection.close()
-        self.shared_cluster.data.remove(client_ip)
-        self.logger.warning(f"Socket of client {client_ip} has been closed.")
+            else:
+                self.logger.warning(f"Got an invalid request from {client_ip}: user {user_request.user}, host {user_request.host}")
+
+    def _state_response(self, base_revision: int):
+        """
+        Build the answer to a FetchState: nothing if the slave is up-to-date, the changes since its revision if it
+        is still known, and the full state otherwise.
+        """
+        revision = self.state_tracker.capture(self.shared_servers.data, self.shared_cluster.data,
+                                              self.shared_requests.data)
+        if base_revision == revision:
+            return StateNotModifiedMessage(revision)
+
+        delta = self.state_tracker.delta_since(base_revision)
+        if delta is None:
+            # The shared data may already be ahead of the captured revision, the full state is the tracked one
+            revision, servers_data, cluster_view, user_requests = self.state_tracker.snapshot()
+            return StateUpdateMessage(servers_data, cluster_view, user_requests, revision)
+
+        return StateDeltaMessage(delta)
 
     def _heartbeat_sender(self):
         self.logger.info(f"Thread <HEARTBEAT_SENDER> started!")
 
         while not self.stop_master_event.is_set():
             self.logger.info("Sending heartbeat broadcast")
-            msg = HeartBeatMessage()
+            msg = self.heartbeat_message()
             self.udp_sender_socket.sendto(msg.to_json().encode(), ('<broadcast>', self.config.UDP_PORT))
             self.stop_master_event.wait(self.config.HEARTBEAT_INTERVAL / 1000)
 
         self.logger.info(f"Thread <HEARTBEAT_SENDER> is shutting down")
 
+    def heartbeat_message(self) -> HeartBeatMessage:
+        """Heartbeat announcing the current state of the master."""
+        revision = self.state_tracker.capture(self.shared_servers.data, self.shared_cluster.data,
+                                              self.shared_requests.data)
+        return HeartBeatMessage(revision, self.state_tracker.digest(), self.epoch)
+
     def _udp_listener(self):
         """
         Start listening for messages of type JoinRequest, Heartbeat, LeaveNotification, ForceMaster
@@ -333,24 +523,24 @@ class User:
                 self.logger.info("Waiting for UDP message...")
 
             try:
-                data, addr = sock.recvfrom(4096)
-                print(addr[0])
-                print([element.to_dict() for element in self.shared_requests.data.requests])
+                data, addr = sock.recvfrom(65535)
 
-                if addr[0] in IpManager.get_own_ips():
+                if IpManager.is_own_ip(addr[0]):
                     show_waiting_log = False
                     continue
 
                 show_waiting_log = True
                 msg = json.loads(data.decode())
-                self._handle_udp(msg, addr[0])
+                self.handle_udp(msg, addr[0])
 
             except socket.timeout:
                 self.logger.warning(f"Timed out waiting for UDP messages. Didn't got Heartbeat from master. Reinitializing connection.")
                 self.restart_tcp_client()
 
-    def _handle_udp(self, msg, src_ip):
-        message = MessageDeserializer().deserialize(msg)
+    def handle_udp(self, msg, src_ip):
+        message = self.udp_deserializer.deserialize(msg)
+        if message is None:
+            return
 
         self.logger.info(f"Received UDP message {message.get_name()} from {src_ip}")
 
@@ -362,19 +552,18 @@ class User:
                 self.restart_tcp_client()
 
         if isinstance(message, JoinRequestMessage) and self.role == Role.MASTER:
-            self._reply_join(src_ip)
+            self._reply_join(src_ip, message.codecs)
             self.logger.info(f"Replied to JoinRequest from {src_ip}")
 
         elif isinstance(message, JoinResponseMessage) and self.role == Role.SLAVE:
-            # Save the ip of the master, and update the data
+            # Save the ip the master answered from, the TCP client fetches the state from it
             self.master_ip = src_ip
-            self.shared_servers.data = message.servers_data
-            self.shared_cluster.data = message.cluster_view
-            self.shared_requests.data = message.user_requests
+            self.master_revision = message.revision
+            self.tcp_codec = get_codec(message.codec)
             self.last_master_heartbeat = time.time()
             self.tcp_client_thread = threading.Thread(target=self._tcp_client, daemon=True)
             self.tcp_client_thread.start()
-            self.logger.info(f"Master identified at address {src_ip} and acquired data successfully")
+            self.logger.info(f"Master identified at address {self.master_ip}, state revision {message.revision}")
 
         elif isinstance(message, HeartBeatMessage):
             if self.shared_is_master.data:
@@ -383,15 +572,25 @@ class User:
             self.last_master_heartbeat = time.time()
             self.logger.info(f"Master still living!")
 
+            if self.role == Role.SLAVE and message.revision != NO_REVISION:
+                # The TCP client fetches the state if it is not the one announced
+                self.master_state = (message.epoch, message.revision, message.digest)
+                self.master_state_event.set()
+                if self.master_ip and not self.tcp_client_thread.is_alive():
+                    self.logger.info(f"Reconnecting to master {self.master_ip}")
+                    self.tcp_client_thread = threading.Thread(target=self._tcp_client, daemon=True)
+                    self.tcp_client_thread.start()
+
         elif isinstance(message, LeaveNotificationMessage):
-            self.shared_cluster.data.remove(src_ip)
+            with self.shared_cluster.mutate() as cluster_view:
+                cluster_view.remove(src_ip)
 
             # If the user who leaved is the master
             if src_ip == self.master_ip:
                 self.master_ip = self.shared_cluster.data.get_highest_ip().nodeIP
                 self.logger.info(f"The master {src_ip} disconnected. The new master is {self.master_ip}")
 
-                if self.master_ip == self.ip:
+                if IpManager.is_own_ip(self.master_ip):
                     self.shared_is_master.data = True # Call self.start_role_tasks()
                     self.logger.info(f"You've been chose as the new master, congratulations!")
             else:
@@ -399,7 +598,8 @@ class User:
 
         elif isinstance(message, ForceMasterMessage):
             self.master_ip = src_ip
-            self.shared_cluster.data.add_or_update(src_ip, Role.MASTER)
+            with self.shared_cluster.mutate() as cluster_view:
+                cluster_view.add_or_update(src_ip, Role.MASTER)
             self.logger.info(f"The slave {src_ip} forced master. Long live to the new master !")
 
             if self.shared_is_master.data:
@@ -429,8 +629,11 @@ class User:
             self.master_ip: str = ""
             threading.Thread(target=self._join_network, daemon=True).start()
 
-    def _reply_join(self, dest_ip):
-        response = JoinResponseMessage(self.shared_servers.data, self.shared_cluster.data, self.shared_requests.data)
+    def _reply_join(self, dest_ip, offered_codecs):
+        codec = negotiate_codec(self.config.WIRE_CODECS, offered_codecs)
+        revision = self.state_tracker.capture(self.shared_servers.data, self.shared_cluster.data,
+                                              self.shared_requests.data)
+        response = JoinResponseMessage(IpManager.get_own_ip(), revision, codec)
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.sendto(response.to_json().encode(), (dest_ip, self.config.UDP_PORT))
         sock.close()
@@ -447,52 +650,55 @@ class User:
         self.shared_is_master.data = True # Call self.start_role_tasks()
 
     def _send_join_request(self):
-        request_message = JoinRequestMessage(self.ip)
+        request_message = JoinRequestMessage(IpManager.get_own_ip(), available_codecs())
         self.udp_sender_socket.sendto(request_message.to_json().encode(), ('<broadcast>', self.config.UDP_PORT))
         self.logger.info("Sent JoinRequest broadcast")
 
     def send_force_master(self):
-        msg = ForceMasterMessage(self.ip)
+        msg = ForceMasterMessage(IpManager.get_own_ip())
         self.udp_sender_socket.sendto(msg.to_json().encode(), ('<broadcast>', self.config.UDP_PORT))
         self.logger.info("Sent ForceMaster broadcast")
 
     def _ssh_polling(self):
         self.logger.info(f"Thread <SSH_POLLING> started!")
         while not self.stop_master_event.is_set():
-            self.stop_master_event.wait(self.config.SERVER_POLLING_INTERVAL / 1000)
-
-            self.shared_servers.data.last_update = int(time.time())
-
-            self.shared_servers.typed_data.servers_list[0].available = False
-            self.shared_servers.typed_data.servers_list[0].reservation = "Raphael"
-            self.shared_servers.typed_data.servers_list[0].since = int(time.time())
-
-            self.shared_servers.typed_data.servers_list[1].available = True
-            self.shared_servers.typed_data.servers_list[1].reservation = ""
-            self.shared_servers.typed_data.servers_list[1].since = -1
+            self.polling_scheduler.sync_hosts(self.shared_servers.typed_data.hosts())
+            due_hosts = self.polling_scheduler.pop_due()
 
-            self.shared_servers.dataChanged.emit()
+            if due_hosts:
+                results = self.ssh_poller.poll_hosts(due_hosts)
+                failed = sum(not result.succeeded for result in results.values())
+                self.logger.info(f"Polled {len(results)} hosts over SSH, {failed} failed")
 
-            # ssh_echo_test(self.config, "localhost", {"rpmqa", "Status", "domains"})
-            self.logger.info("SSH command sent!")
+                # Merge the whole batch at once, so the views are refreshed a single time
+                with self.shared_servers.mutate() as servers_data:
+                    changed_hosts = servers_data.apply_poll_results(results)
+                for host, result in results.items():
+                    self.polling_scheduler.report(host, host in changed_hosts, not result.succeeded)
 
-            self.stop_master_event.wait(self.config.SERVER_POLLING_INTERVAL / 1000)
+            self.polling_scheduler.wait(1)
 
-            self.shared_servers.data.last_update = int(time.time())
-
-            self.shared_servers.typed_data.servers_list[0].available = True
-            self.shared_servers.typed_data.servers_list[0].reservation = ""
-            self.shared_servers.typed_data.servers_list[0].since = -1
-
-            self.shared_servers.typed_data.servers_list[1].available = False
-            self.shared_servers.typed_data.servers_list[1].reservation = "Odelia"
-            self.shared_servers.typed_data.servers_list[1].since = time.time()
+        # Only the master polls the servers, a slave keeps no connection to them
+        self.ssh_poller.close_connections()
+        self.logger.info(f"Thread <SSH_POLLING> is shutting down")
 
-            self.logger.info("SSH command sent!")
+    def refresh_host(self, host: str):
+        """
+        Poll a single host on demand: it jumps the queue of the polling scheduler, and only its server is patched.
+        Blocks until the host has been polled.
+        """
+        if self.role != Role.MASTER:
+            raise RuntimeError("Only the master polls the servers")
 
-            self.shared_servers.dataChanged.emit()
+        done = self.polling_scheduler.request_refresh(host)
+        if done is None:
+            raise RuntimeError(f"Host {host} is not polled")
 
-        self.logger.info(f"Thread <SSH_POLLING> is shutting down")
+        # A poll lasts at most the SSH timeout, the batch in progress may have to finish first
+        if done.wait(2 * self.config.SSH_TIMEOUT / 1000):
+            self.logger.info(f"Refreshed host {host}")
+        else:
+            self.logger.warning(f"Timed out waiting for the refresh of host {host}")
 
     def _data_saver(self):
         """
@@ -507,23 +713,25 @@ class User:
 
         while not self.stop_master_event.is_set():
             self.stop_master_event.wait(self.config.SAVING_INTERVAL / 1000)
+            self.save_server_data(save_dir)
 
-            filename = save_dir / "ServersData.json"
-            try:
-                data = self.shared_servers.data.to_dict()
-            except Exception as e:
-                self.logger.error(f"Failed to serialize servers_data: {e}")
-                continue
+        self.logger.info(f"Thread <DATA_SAVER> is shutting down")
 
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    text = json.dumps(data, ensure_ascii=False, indent=2)
-                    f.write(text)
-                self.logger.info(f"Saved servers_data snapshot to {filename}")
-            except Exception as e:
-                self.logger.error(f"Error writing to {filename}: {e}")
+    def save_server_data(self, save_dir: Path):
+        filename = save_dir / "ServersData.json"
+        try:
+            data = self.shared_servers.data.to_dict()
+        except Exception as e:
+            self.logger.error(f"Failed to serialize servers_data: {e}")
+            return
 
-        self.logger.info(f"Thread <DATA_SAVER> is shutting down")
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                text = json.dumps(data, ensure_ascii=False, indent=2)
+                f.write(text)
+            self.logger.info(f"Saved servers_data snapshot to {filename}")
+        except Exception as e:
+            self.logger.error(f"Error writing to {filename}: {e}")
 
     def shutdown(self):
         self._send_leave()
@@ -532,6 +740,9 @@ class User:
         self.stop_slave_event.set()
         self.udp_sender_socket.close()
 
+        if self.network_core is not None:
+            self.network_core.stop()
+
         if self.heartbeat_sender_thread.is_alive():
             self.heartbeat_sender_thread.join(1)
         if self.udp_listener_thread.is_alive():
@@ -542,15 +753,18 @@ class User:
             self.tcp_client_thread.join(1)
         if self.ssh_polling_thread.is_alive():
             self.ssh_polling_thread.join(1)
+        self.ssh_poller.shutdown()
         if self.data_saver_thread.is_alive():
             self.data_saver_thread.join(1)
+        if self.state_publisher_thread.is_alive():
+            self.state_publisher_thread.join(1)
 
         for thread in self.active_client_threads:
             if thread.is_alive():
                 thread.join(1)
 
     def _send_leave(self):
-        msg = LeaveNotificationMessage(self.ip)
+        msg = LeaveNotificationMessage(IpManager.get_own_ip())
         self.logger.info("Sending leaving message...")
         self.udp_sender_socket.sendto(msg.to_json().encode(), ('<broadcast>', self.config.UDP_PORT))
         self.logger.info("Sent LeaveNotification")
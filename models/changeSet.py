@@ -0,0 +1,54 @@
+from dataclasses import dataclass, field
+
+from models.userRequest import UserRequest
+
+
+@dataclass
+class ChangeSet:
+    """
+    What changed in a shared model between two snapshots, carried by its `changed` signal.
+    When `full` is set, the change cannot be described row by row (servers added or removed, role of the user...)
+    and the listeners must consider that everything changed.
+    """
+    full: bool = False
+    polled: bool = False  # The servers were polled again, which moves their poll time even if nothing changed
+    changed_servers: dict[str, set[str]] = field(default_factory=dict)  # Host -> names of the changed fields
+    joined_nodes: list[str] = field(default_factory=list)
+    left_nodes: list[str] = field(default_factory=list)
+    changed_nodes: list[str] = field(default_factory=list)  # Nodes whose role changed
+    added_requests: list[UserRequest] = field(default_factory=list)
+    removed_requests: list[UserRequest] = field(default_factory=list)
+
+    def merge(self, other: "ChangeSet") -> "ChangeSet":
+        """Add the changes of a later change set to this one."""
+        self.full |= other.full
+        self.polled |= other.polled
+        for host, fields in other.changed_servers.items():
+            self.changed_servers.setdefault(host, set()).update(fields)
+
+        for ip in other.joined_nodes:
+            if ip in self.left_nodes:
+                self.left_nodes.remove(ip)
+                self.changed_nodes.append(ip)
+            else:
+                self.joined_nodes.append(ip)
+        for ip in other.left_nodes:
+            if ip in self.joined_nodes:
+                self.joined_nodes.remove(ip)
+            else:
+                self.left_nodes.append(ip)
+        self.changed_nodes.extend(ip for ip in other.changed_nodes
+                                  if ip not in self.joined_nodes and ip not in self.changed_nodes)
+
+        self.added_requests.extend(other.added_requests)
+        for request in other.removed_requests:
+            added = [entry for entry in self.added_requests if entry.key() == request.key()]
+            if added:
+                self.added_requests.remove(added[0])
+            else:
+                self.removed_requests.append(request)
+        return self
+
+    def is_empty(self) -> bool:
+        return not (self.full or self.polled or self.changed_servers or self.joined_nodes or self.left_nodes or self.changed_nodes
+                    or self.added_requests or self.removed_requests)
@@ -2,6 +2,8 @@ from models.role import Role
 
 
 class ClusterNode:
+    __slots__ = ("nodeIP", "role")
+
     def __init__(self, node_ip="", role=None):
         self.nodeIP: str = node_ip
         self.role: Role | None = role
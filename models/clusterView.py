@@ -14,9 +14,10 @@ class ClusterView:
 
     def add_or_update(self, node_ip, role):
         with self.lock:
-            for n in self.nodes:
+            for index, n in enumerate(self.nodes):
                 if n.nodeIP == node_ip:
-                    n.role = role
+                    # Nodes may be shared with a clone, they are replaced instead of modified
+                    self.nodes[index] = ClusterNode(node_ip, role)
                     return
             self.nodes.append(ClusterNode(node_ip, role))
 
@@ -36,4 +37,11 @@ class ClusterView:
 
     def to_dict(self):
         with self.lock:
-            return [n.to_dict() for n in self.nodes]
\ No newline at end of file
+            return [n.to_dict() for n in self.nodes]
+
+    def clone(self):
+        # The nodes are never modified in place, the clone shares them
+        with self.lock:
+            new = ClusterView()
+            new.nodes = list(self.nodes)
+        return new
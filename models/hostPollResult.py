@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class HostPollResult:
+    host: str
+    fields: dict[str, str] = field(default_factory=dict)  # ServerElement fields read on the host
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
@@ -1,4 +1,10 @@
+import sys
+
+
 class ServerElement:
+    # No __dict__ per element, which matters with tens of thousands of servers
+    __slots__ = ("host", "app", "status", "env", "available", "reservation", "since", "comment", "last_update")
+
     def __init__(self):
         self.host: str = ""
         self.app: str = ""
@@ -8,21 +14,37 @@ class ServerElement:
         self.reservation: str = ""
         self.since: int = 0
         self.comment: str = ""
+        self.last_update: int = 0  # Last time the host was polled successfully
 
     def from_json(self, data_element: dict):
         self.host = data_element.get("host", "")
-        self.app = data_element.get("app", "")
-        self.status = data_element.get("status", "")
-        self.env = data_element.get("env", "")
+        # These fields only take a few values, every server shares the same string objects
+        self.app = sys.intern(data_element.get("app", ""))
+        self.status = sys.intern(data_element.get("status", ""))
+        self.env = sys.intern(data_element.get("env", ""))
         self.available = data_element.get("available", None)
         self.reservation = data_element.get("reservation", "")
         self.since = data_element.get("since", 0)
         self.comment = data_element.get("comment", "")
+        self.last_update = data_element.get("lastUpdate", 0)
         return self
 
     def to_dict(self):
         return {"host": self.host, "app": self.app, "status": self.status, "env": self.env, "available": self.available,
-                "reservation": self.reservation, "since": self.since, "comment": self.comment}
+                "reservation": self.reservation, "since": self.since, "comment": self.comment,
+                "lastUpdate": self.last_update}
+
+    def changed_fields(self, other: "ServerElement") -> set[str]:
+        """
+        :return: the names of the fields whose value differs in the other element, the time of the poll excluded
+        """
+        return {name for name in self.__slots__
+                if name != "last_update" and getattr(self, name) != getattr(other, name)}
+
+    def fingerprint(self) -> tuple:
+        """Values of the shown fields, to find cheaply whether a server changed. The time of the poll is left out."""
+        return (self.host, self.app, self.status, self.env, self.available, self.reservation, self.since,
+                self.comment)
 
     def clone(self):
         new = ServerElement()
@@ -34,4 +56,5 @@ class ServerElement:
         new.reservation = self.reservation
         new.since = self.since
         new.comment = self.comment
+        new.last_update = self.last_update
         return new
\ No newline at end of file
@@ -1,20 +1,154 @@
+import sys
 import threading
 import time
 
+from models.hostPollResult import HostPollResult
 from models.serverElement import ServerElement
 
 
 class ServersData:
     def __init__(self, last_update=0, servers_list=None):
         self.last_update: int = last_update
+        # Position of the first server of every host in the list, and of the next ones for the hosts appearing in
+        # several rows. Most hosts appear once, they don't need a list of positions
+        self._hosts_index: dict[str, int] = {}
+        self._duplicates_index: dict[str, list[int]] = {}
+        # Elements shared with a clone are copied before being modified. None when no element is shared
+        self._owned: set[int] | None = None
         self.servers_list: list[ServerElement] = servers_list
         self.lock = threading.Lock()
 
+    @property
+    def servers_list(self) -> list[ServerElement]:
+        return self._servers_list
+
+    @servers_list.setter
+    def servers_list(self, servers_list: list[ServerElement]):
+        # The list is always replaced as a whole, the index is rebuilt with it
+        self._servers_list = servers_list
+        self._owned = None
+        self._hosts_index = {}
+        self._duplicates_index = {}
+        for position, element in enumerate(servers_list or []):
+            if element.host in self._hosts_index:
+                self._duplicates_index.setdefault(element.host, []).append(position)
+            else:
+                self._hosts_index[element.host] = position
+
     def update(self, servers_list):
         with self.lock:
             self.servers_list = servers_list
             self.last_update = int(time.time())
 
+    def hosts(self) -> list[str]:
+        """
+        :return: every host once, in the order of the list
+        """
+        return list(self._hosts_index)
+
+    def _positions(self, host: str) -> list[int]:
+        position = self._hosts_index.get(host)
+        if position is None:
+            return []
+        return [position] + self._duplicates_index.get(host, [])
+
+    def get_servers(self, host: str) -> list[ServerElement]:
+        """
+        :return: all the servers of the host, an empty list if it is unknown
+        """
+        return [self._servers_list[position] for position in self._positions(host)]
+
+    def get_server(self, host: str) -> ServerElement | None:
+        """
+        :return: the first server of the host, None if it is unknown
+        """
+        position = self._hosts_index.get(host)
+        return None if position is None else self._servers_list[position]
+
+    def _writable(self, position: int) -> ServerElement:
+        """
+        :return: the element at the given position, copied first if it is still shared with a clone
+        """
+        element = self._servers_list[position]
+        if self._owned is None or id(element) in self._owned:
+            return element
+
+        element = element.clone()
+        self._servers_list[position] = element
+        self._owned.add(id(element))
+        return element
+
+    def update_server(self, host: str, **fields) -> bool:
+        """
+        Set the given fields on the first server of the host.
+        :return: False if the host is unknown
+        """
+        with self.lock:
+            position = self._hosts_index.get(host)
+            if position is None:
+                return False
+
+            element = self._writable(position)
+            for name, value in fields.items():
+                setattr(element, name, value)
+            return True
+
+    def add_server(self, element: ServerElement):
+        with self.lock:
+            self._servers_list = (self._servers_list or []) + [element]
+            # The indexes may be shared with a clone, they are replaced instead of modified
+            position = len(self._servers_list) - 1
+            if element.host in self._hosts_index:
+                self._duplicates_index = {**self._duplicates_index,
+                                          element.host: self._duplicates_index.get(element.host, []) + [position]}
+            else:
+                self._hosts_index = {**self._hosts_index, element.host: position}
+            if self._owned is not None:
+                self._owned.add(id(element))
+
+    def remove_servers(self, host: str) -> bool:
+        """
+        Remove all the servers of the host.
+        :return: False if the host is unknown
+        """
+        with self.lock:
+            if host not in self._hosts_index:
+                return False
+
+            shared = self._owned is not None
+            self.servers_list = [element for element in self._servers_list if element.host != host]
+            if shared:
+                # The remaining elements may still be shared with a clone
+                self._owned = set()
+            return True
+
+    def apply_poll_results(self, results: dict[str, HostPollResult]) -> set[str]:
+        """
+        Merge the fields read on the hosts into the servers, in a single batch. Every server of a host polled
+        successfully is stamped with the time of the poll, and the list with the time of the batch, but only the
+        fields read are compared: a poll finding nothing new only moves the timestamps.
+        :return: the hosts whose fields changed
+        """
+        changed = set()
+        now = int(time.time())
+        with self.lock:
+            for host, result in results.items():
+                if not result.succeeded:
+                    continue
+
+                self.last_update = now
+                for position in self._positions(host):
+                    fields = {name: value for name, value in result.fields.items()
+                              if getattr(self._servers_list[position], name) != value}
+                    element = self._writable(position)
+                    for name, value in fields.items():
+                        setattr(element, name, sys.intern(value) if isinstance(value, str) else value)
+                    element.last_update = now
+                    if fields:
+                        changed.add(host)
+
+        return changed
+
     @staticmethod
     def from_json(data):
         last_update = data.get("lastUpdate", 0)
@@ -28,9 +162,18 @@ class ServersData:
                     "serversList": [s.to_dict() for s in self.servers_list]}
 
     def clone(self):
+        """
+        Copy-on-write clone: both objects share the elements, and each one copies an element before modifying it.
+        The clone only copies the list of references, not the elements.
+        """
         with self.lock:
             new = ServersData()
             new.last_update = self.last_update
-            # deep‐copy only the plain data, not the lock
-            new.servers_list = [s.clone() for s in self.servers_list]
+            if self._servers_list is not None:
+                new._servers_list = list(self._servers_list)
+                # The indexes are never modified in place
+                new._hosts_index = self._hosts_index
+                new._duplicates_index = self._duplicates_index
+                new._owned = set()
+                self._owned = set()
         return new
@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class StateDelta:
+    """
+    Changes of the shared state between two revisions.
+    Rows are kept as plain dicts, in the same format as the full state.
+    """
+    base_revision: int
+    revision: int
+    last_update: int = 0
+    servers_count: int = 0
+    changed_servers: list[tuple[int, dict]] = field(default_factory=list)
+    changed_nodes: list[dict] = field(default_factory=list)
+    removed_nodes: list[str] = field(default_factory=list)
+    added_requests: list[dict] = field(default_factory=list)
+    removed_requests: list[str] = field(default_factory=list)
+
+    @staticmethod
+    def from_json(data):
+        return StateDelta(base_revision=data.get("baseRevision", -1),
+                          revision=data.get("revision", -1),
+                          last_update=data.get("lastUpdate", 0),
+                          servers_count=data.get("serversCount", 0),
+                          changed_servers=[(index, row) for index, row in data.get("changedServers", [])],
+                          changed_nodes=data.get("changedNodes", []),
+                          removed_nodes=data.get("removedNodes", []),
+                          added_requests=data.get("addedRequests", []),
+                          removed_requests=data.get("removedRequests", []))
+
+    def to_dict(self):
+        return {"baseRevision": self.base_revision, "revision": self.revision, "lastUpdate": self.last_update,
+                "serversCount": self.servers_count,
+                "changedServers": [[index, row] for index, row in self.changed_servers],
+                "changedNodes": self.changed_nodes, "removedNodes": self.removed_nodes,
+                "addedRequests": self.added_requests, "removedRequests": self.removed_requests}
+
+    def is_empty(self):
+        return not (self.changed_servers or self.changed_nodes or self.removed_nodes or self.added_requests
+                    or self.removed_requests)
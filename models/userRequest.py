@@ -1,4 +1,6 @@
 class UserRequest:
+    __slots__ = ("nodeIP", "timestamp", "available", "host", "user", "comment")
+
     def __init__(self, nodeIP="", timestamp=0, available=False, host="", user="", comment=""):
         self.nodeIP: str = nodeIP
         self.timestamp: int = timestamp
@@ -10,12 +12,16 @@ class UserRequest:
     def from_json(self, data):
         self.nodeIP = data.get("nodeIP", "")
         self.timestamp = data.get("timestamp", 0)
-        self.available = data.get("operation", False)
+        self.available = data.get("available", data.get("operation", False))
         self.host = data.get("host", "")
         self.user = data.get("user", "")
         self.comment = data.get("comment", "")
         return self
 
+    def key(self) -> tuple:
+        """Identify the request, whatever the object holding it."""
+        return self.nodeIP, self.timestamp, self.host, self.user
+
     def to_dict(self):
         return {"nodeIP": self.nodeIP, "timestamp": self.timestamp, "available": self.available, "host": self.host,
                 "user": self.user, "comment": self.comment}
@@ -13,8 +13,10 @@ class UsersRequests:
         return self
 
     def add(self, req: UserRequest):
+        # A request may be received several times, it is only kept once
         with self.lock:
-            self.requests.append(req)
+            if all(r.key() != req.key() for r in self.requests):
+                self.requests.append(req)
 
     def to_list(self):
         with self.lock:
@@ -22,4 +24,16 @@ class UsersRequests:
 
     def to_dict(self):
         with self.lock:
-            return [r.to_dict() for r in self.requests]
\ No newline at end of file
+            return [r.to_dict() for r in self.requests]
+
+    def remove(self, req: UserRequest):
+        # The request may come from an older snapshot, it is matched by its key
+        with self.lock:
+            self.requests = [r for r in self.requests if r.key() != req.key()]
+
+    def clone(self):
+        # The requests are never modified in place, the clone shares them
+        with self.lock:
+            new = UsersRequests()
+            new.requests = list(self.requests)
+        return new
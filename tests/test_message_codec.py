@@ -0,0 +1,26 @@
+import unittest
+
+from infrastructure.message_codec import StructCodec
+
+
+class StructCodecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = StructCodec()
+
+    def round_trip(self, msg: dict) -> dict:
+        return self.codec.decode(self.codec.encode(msg))
+
+    def test_table_round_trip(self):
+        rows = [{"host": "srv1", "since": 12, "available": True, "comment": None},
+                {"host": "srv2", "since": -1, "available": False, "comment": "down"}]
+        msg = {"Type": "StateUpdate", "Payload": {"serversList": rows, "revision": 3}}
+        self.assertEqual(self.round_trip(msg), msg)
+
+    def test_rows_without_keys_are_kept(self):
+        msg = {"Type": "StateDelta", "Payload": {"changes": [{}, {}], "nested": [[{}, {}, {}]]}}
+        self.assertEqual(self.round_trip(msg), msg)
+
+
+if __name__ == "__main__":
+    unittest.main()